@@ -0,0 +1,14 @@
+# Input generator for https://adventofcode.com/2021/day/1
+
+import random
+from typing import Iterator
+
+
+# size: number of depth readings
+def generate(size: int, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+    depth = rng.randint(100, 200)
+
+    for _ in range(0, size):
+        yield str(depth)
+        depth = max(0, depth + rng.randint(-10, 20))
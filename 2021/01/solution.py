@@ -1,39 +1,74 @@
 # https://adventofcode.com/2021/day/1
 
-import os
 from pathlib import Path
+from typing import Iterable, Iterator
 
-def part1(input: str) -> str:
-    answer = 0
+import numpy as np
 
-    lines = input.splitlines()
+from aoc.loader import Buffer, parse_ints
 
-    for i in range(1, len(lines)):
-        if int(lines[i]) > int(lines[i - 1]):
-            answer += 1
+CHUNK_SIZE = 1 << 24
 
-    return str(answer)
+# splits a newline-separated buffer into arrays of depths, CHUNK_SIZE bytes at a time,
+# so the input never has to be decoded (or even read) as a whole
+def depth_chunks(buffer: Buffer, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    view = memoryview(buffer)
+    start = 0
 
-def part2(input: str) -> str:
-    answer = 0
+    while start < len(view):
+        chunk = bytes(view[start:start + chunk_size])
+
+        if start + len(chunk) < len(view):
+            end = chunk.rfind(b'\n') + 1
+            if end == 0:
+                raise ValueError(f"line longer than chunk_size ({chunk_size} bytes)")
+            chunk = chunk[0:end]
+
+        yield parse_ints(chunk)
+
+        start += len(chunk)
+
+# a window sum of size k grows exactly when the reading entering it is larger than the one leaving it,
+# so comparing a[i] > a[i - k] counts increases of the k-window sums
+def count_increases(depths: np.ndarray, window: int = 1) -> int:
+    if len(depths) <= window:
+        return 0
+
+    return int(np.count_nonzero(depths[window:] > depths[:-window]))
 
-    lines = input.splitlines()
+# same as count_increases over the concatenated chunks; the last `window` readings
+# are carried across chunk boundaries
+def count_increases_streaming(chunks: Iterable[np.ndarray], window: int = 1) -> int:
+    count = 0
+    tail = np.empty(0, dtype=np.int64)
 
-    for i in range(3, len(lines)):
-        if (int(lines[i]) + int(lines[i - 1]) + int(lines[i - 2]) > int(lines[i - 1]) + int(lines[i - 2]) + int(lines[i - 3])):
-            answer += 1
+    for chunk in chunks:
+        joined = np.concatenate((tail, chunk))
+        # tail holds at most `window` readings, so no pair inside it is counted twice
+        count += count_increases(joined, window)
+        tail = joined[-window:]
 
-    return str(answer)
+    return count
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
+def sweep(buffer: Buffer, window: int = 1, chunk_size: int = CHUNK_SIZE) -> int:
+    return count_increases_streaming(depth_chunks(buffer, chunk_size), window)
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def parse_buffer(buffer: Buffer) -> np.ndarray:
+    chunks = list(depth_chunks(buffer))
 
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    return np.concatenate(chunks) if len(chunks) > 0 else np.empty(0, dtype=np.int64)
+
+def parse(input: str) -> np.ndarray:
+    return parse_buffer(input.encode())
+
+def solve1(depths: np.ndarray) -> str:
+    return str(count_increases(depths, 1))
+
+def solve2(depths: np.ndarray) -> str:
+    return str(count_increases(depths, 3))
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,14 @@
+# Input generator for https://adventofcode.com/2021/day/2
+
+import random
+from typing import Iterator
+
+directions = ["forward", "down", "up"]
+
+
+# size: number of instructions
+def generate(size: int, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    for _ in range(0, size):
+        yield f"{rng.choice(directions)} {rng.randint(1, 9)}"
@@ -1,71 +1,79 @@
 # https://adventofcode.com/2021/day/2
 
-import os
-from typing import Any, List 
-from typing_extensions import Literal, NamedTuple
-from dataclasses import dataclass
+from typing import Sequence
+from typing_extensions import NamedTuple
 
-Direction = Literal['forward', 'down', 'up']
-Instruction = NamedTuple('Instruction', [("direction", Direction), ("count", int)])
+import numpy as np
 
-@dataclass
-class Position:
-    horizontal: int = 0
-    depth: int = 0
-    aim: int = 0
+from aoc.loader import Buffer, parse_ints
 
+# direction codes are the first byte of each command
+FORWARD = ord('f')
+DOWN = ord('d')
+UP = ord('u')
 
-def parse_input(input: str) -> List[Instruction]:
-    instructions: List[Instruction] = []
+# the whole command log as two parallel arrays
+Commands = NamedTuple('Commands', [("directions", np.ndarray), ("counts", np.ndarray)])
 
-    for line in input.splitlines():
-        words = line.split(' ')
-        direction: Any = words[0]
-        count = words[1]
+# final state of every submarine in a fleet; depth is the part 1 reading,
+# aim and aimed_depth the part 2 ones
+FleetPositions = NamedTuple('FleetPositions', [("horizontal", np.ndarray), ("depth", np.ndarray),
+                                               ("aim", np.ndarray), ("aimed_depth", np.ndarray)])
 
-        instructions.append(Instruction(direction, int(count)))
 
-    return instructions
+def parse_buffer(buffer: Buffer) -> Commands:
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    line_starts = np.concatenate(([0], np.flatnonzero(raw == ord('\n')) + 1))
+    line_starts = line_starts[line_starts < len(raw)]
+    # skip blank lines
+    line_starts = line_starts[raw[line_starts] >= ord('a')]
 
-def part1(input: str) -> str:
-    position = Position()
-    instructions = parse_input(input)
+    # blank out the words; what is left is a whitespace-separated list of counts
+    digits = raw.copy()
+    digits[(digits >= ord('a')) & (digits <= ord('z'))] = ord(' ')
+
+    return Commands(raw[line_starts].copy(), parse_ints(digits.tobytes()))
+
+def parse(input: str) -> Commands:
+    return parse_buffer(input.encode())
+
+def segment_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    totals = np.concatenate(([0], np.cumsum(values)))
+
+    return totals[ends] - totals[starts]
+
+# replays every command stream at once: each one is a contiguous segment of the
+# concatenated arrays, and per-submarine sums are differences of one prefix sum
+def replay_fleet(fleet: Sequence[Commands]) -> FleetPositions:
+    lengths = np.array([len(commands.counts) for commands in fleet], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    directions = np.concatenate([commands.directions for commands in fleet])
+    counts = np.concatenate([commands.counts for commands in fleet])
 
-    for instruction in instructions:
-        if instruction.direction == "up":
-            position.depth -= instruction.count
-        elif instruction.direction == "down":
-            position.depth += instruction.count
-        elif instruction.direction == "forward":
-            position.horizontal += instruction.count
+    forward = np.where(directions == FORWARD, counts, 0)
+    vertical = np.where(directions == DOWN, counts, 0) - np.where(directions == UP, counts, 0)
 
+    # aim after each command, restarting at 0 for every submarine
+    aim_totals = np.concatenate(([0], np.cumsum(vertical)))
+    aim = aim_totals[1:] - np.repeat(aim_totals[starts], lengths)
 
-    return str(position.horizontal * position.depth)
+    return FleetPositions(segment_sums(forward, starts, ends), segment_sums(vertical, starts, ends),
+                          segment_sums(vertical, starts, ends), segment_sums(aim * forward, starts, ends))
+
+def solve1(commands: Commands) -> str:
+    positions = replay_fleet([commands])
+
+    return str(int(positions.horizontal[0]) * int(positions.depth[0]))
+
+def solve2(commands: Commands) -> str:
+    positions = replay_fleet([commands])
+
+    return str(int(positions.horizontal[0]) * int(positions.aimed_depth[0]))
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
 def part2(input: str) -> str:
-    position = Position()
-    instructions = parse_input(input)
-
-    for instruction in instructions:
-        if instruction.direction == "up":
-            position.aim -= instruction.count
-        elif instruction.direction == "down":
-            position.aim += instruction.count
-        elif instruction.direction == "forward":
-            position.horizontal += instruction.count
-            position.depth += position.aim * instruction.count
-
-    return str(position.horizontal * position.depth)
-
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
-
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    return solve2(parse(input))
@@ -0,0 +1,12 @@
+# Input generator for https://adventofcode.com/2021/day/3
+
+import random
+from typing import Iterator
+
+
+# size: number of readings, each `width` bits wide
+def generate(size: int, seed: int = 0, width: int = 12) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    for _ in range(0, size):
+        yield format(rng.getrandbits(width), f"0{width}b")
@@ -1,88 +1,113 @@
 # https://adventofcode.com/2021/day/3
 
-import os
 from pathlib import Path
-from typing import Dict, List
+from typing import List, NamedTuple
 
+import numpy as np
 
-def binary_to_decimal(binary: str) -> int:
-    n = 0
+from aoc.loader import Buffer
 
-    for i in range(0, len(binary)):
-        n += int(binary[i]) * (2 ** (len(binary) - i - 1))
+# every reading packed into one uint64, sorted so that readings sharing a bit
+# prefix form a contiguous range
+Report = NamedTuple("Report", [("values", np.ndarray), ("width", int)])
 
-    return n
 
+def parse_buffer(buffer: Buffer) -> Report:
+    raw = np.frombuffer(buffer, dtype=np.uint8)
 
-def split_by_bit_in_position(binary_numbers: List[str], position: int) -> Dict[str, List[str]]:
-    result: Dict[str, List[str]] = {"0": [], "1": []}
+    # CRLF line endings and trailing blank lines would otherwise count as bits
+    if ord('\r') in raw:
+        raw = raw[raw != ord('\r')]
 
-    for number in binary_numbers:
-        result[number[position]].append(number)
+    content = np.flatnonzero(raw != ord('\n'))
+    raw = raw[:content[-1] + 1] if len(content) > 0 else raw[:0]
 
-    return result
+    if len(raw) > 0:
+        raw = np.append(raw, np.uint8(ord('\n')))
 
+    newlines = np.flatnonzero(raw == ord('\n'))
+    width = int(newlines[0]) if len(newlines) > 0 else 0
 
-def part1(input: str) -> str:
+    if width > 64:
+        raise ValueError(f"readings are {width} bits wide, at most 64 are supported")
+
+    if len(raw) % (width + 1) != 0:
+        raise ValueError("all readings must have the same width")
+
+    bits = raw.reshape(-1, width + 1)[:, 0:width] - ord('0')
+    values = np.zeros(len(bits), dtype=np.uint64)
+
+    for column in range(0, width):
+        values = (values << np.uint64(1)) | bits[:, column]
+
+    values.sort()
+
+    return Report(values, width)
+
+
+def parse(input: str) -> Report:
+    return parse_buffer(input.encode())
+
+
+def column_ones(report: Report) -> List[int]:
+    # number of readings with each bit set, most significant bit first
+    return [int(np.count_nonzero(report.values & np.uint64(1 << (report.width - 1 - position))))
+            for position in range(0, report.width)]
+
+
+def solve1(report: Report) -> str:
     gammaRate = 0
     epsilonRate = 0
-    lines = input.splitlines()
-    bitsCount = len(lines[0])
-    bitOccurences: Dict[int, Dict[str, int]] = {}
+    total = len(report.values)
 
-    for n in lines:
-        for position in range(0, len(n)):
-            if position not in bitOccurences:
-                bitOccurences[position] = {"0": 0, "1": 0}
+    for position, ones in enumerate(column_ones(report)):
+        bit = 1 << (report.width - position - 1)
+        gammaRate += bit if ones > total - ones else 0
+        epsilonRate += bit if ones < total - ones else 0
 
-            bitOccurences[position][n[position]] += 1
+    return str(gammaRate * epsilonRate)
 
-    print(bitOccurences)
-    for position in bitOccurences:
-        gammaRate += 2 ** (bitsCount - position - 1) * \
-            (bitOccurences[position]["1"] >
-             bitOccurences[position]["0"] and 1 or 0)
-        epsilonRate += 2 ** (bitsCount - position - 1) * (
-            bitOccurences[position]["1"] < bitOccurences[position]["0"] and 1 or 0)
 
-    return str(gammaRate * epsilonRate)
+# narrows [lo, hi) of the sorted readings one bit at a time: within the range
+# all readings share their higher bits, so the ones with the current bit set
+# start at a single binary-searchable index
+def find_rating(report: Report, keep_most_common: bool) -> int:
+    values = report.values
+    lo = 0
+    hi = len(values)
 
+    for position in range(0, report.width):
+        if hi - lo <= 1:
+            break
 
-def part2(input: str) -> str:
-    lines = input.splitlines()
-    bitsCount = len(lines[0])
-    oxygen_generator_rating_eligible_numbers: List[str] = lines
-    co2_scrubber_rating_eligible_numbers: List[str] = lines
+        bit = 1 << (report.width - position - 1)
+        prefix = int(values[lo]) & ~((bit << 1) - 1)
+        split = lo + int(np.searchsorted(values[lo:hi], np.uint64(prefix | bit)))
+        zeros = split - lo
+        ones = hi - split
+
+        # if every remaining reading has the same bit, they all stay
+        if zeros == 0 or ones == 0:
+            continue
 
-    for position in range(0, bitsCount):
-        if len(oxygen_generator_rating_eligible_numbers) > 1:
-            splits = split_by_bit_in_position(
-                oxygen_generator_rating_eligible_numbers, position)
-            oxygen_generator_rating_eligible_numbers = len(
-                splits["1"]) >= len(splits["0"]) and splits["1"] or splits["0"]
+        if (ones >= zeros) == keep_most_common:
+            lo = split
+        else:
+            hi = split
 
-        if len(co2_scrubber_rating_eligible_numbers) > 1:
-            splits = split_by_bit_in_position(
-                co2_scrubber_rating_eligible_numbers, position)
-            co2_scrubber_rating_eligible_numbers = len(
-                splits["0"]) <= len(splits["1"]) and splits["0"] or splits["1"]
+    return int(values[lo])
 
-    print(oxygen_generator_rating_eligible_numbers,
-          co2_scrubber_rating_eligible_numbers)
 
-    return str(binary_to_decimal(oxygen_generator_rating_eligible_numbers[0]) * binary_to_decimal(co2_scrubber_rating_eligible_numbers[0]))
+def solve2(report: Report) -> str:
+    oxygen_generator_rating = find_rating(report, True)
+    co2_scrubber_rating = find_rating(report, False)
 
+    return str(oxygen_generator_rating * co2_scrubber_rating)
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
 
-if __name__ == "__main__":
-    main()
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,21 @@
+# Input generator for https://adventofcode.com/2021/day/4
+
+import random
+from typing import Iterator
+
+
+# size: number of boards; every number in range(numbers) is drawn, so all boards win
+def generate(size: int, seed: int = 0, numbers: int = 100) -> Iterator[str]:
+    rng = random.Random(seed)
+    drawn_numbers = list(range(0, numbers))
+    rng.shuffle(drawn_numbers)
+
+    yield ','.join(map(str, drawn_numbers))
+
+    for _ in range(0, size):
+        board = rng.sample(range(0, numbers), 25)
+
+        yield ""
+
+        for row in range(0, 5):
+            yield ' '.join(f"{n:>2}" for n in board[row * 5:row * 5 + 5])
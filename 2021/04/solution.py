@@ -1,108 +1,156 @@
 # https://adventofcode.com/2021/day/4
 
-import os
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, List, Set, Tuple
 from typing_extensions import NamedTuple
 from dataclasses import dataclass
-from functools import reduce
 
+import numpy as np
 
-@dataclass
-class BoardNode:
-    n: int
-    marked: bool
+from aoc.instrument import instrumented
 
 
-class Board:
-    matrix: List[List[BoardNode]]
+# boards are kept as plain number matrices; engines keep their marking state to themselves
+@ dataclass(frozen=True)
+class Input:
+    drawn_numbers: List[int]
+    boards: List[List[List[int]]]
 
-    def __init__(self, matrix: List[List[int]]):
-        self.matrix = list(map(lambda row: list(map(
-            lambda n: BoardNode(n, False), row)), matrix))
 
-    def mark(self, number: int):
-        for row in self.matrix:
-            for node in row:
-                if node.n == number:
-                    node.marked = True
+def parse(input: str) -> Input:
+    lines = input.splitlines()
+    drawnNumbers: List[int] = list(map(lambda s: int(s), lines[0].split(",")))
+    boards: List[List[List[int]]] = []
 
-    def has_bingo(self) -> bool:
-        bingo_rows = reduce(lambda sum, row: sum + (
-            1 if all(map(lambda node: node.marked, row)) else 0), self.matrix, 0)
+    for i in range(1, len(lines)):
+        if lines[i] == "":
+            boards.append([])
+        else:
+            boards[-1].append(list(map(lambda s: int(s.strip(' ')),
+                                       filter(lambda s: len(s) > 0, lines[i].split(' ')))))
 
-        bingo_cols = reduce(lambda sum, col: sum + all(map(lambda row: self.matrix[row][col].marked, range(
-            0, len(self.matrix)))), range(0, len(self.matrix[0])), 0)
+    return Input(drawnNumbers, boards)
 
-        return bingo_rows + bingo_cols > 0
 
-    def get_score(self, multiplier: int) -> int:
-        sum_of_unmarked = 0
+Win = NamedTuple("Win", [("board", int), ("turn", int),
+                         ("number", int), ("score", int)])
 
-        for row in self.matrix:
-            for node in row:
-                sum_of_unmarked += node.n if not node.marked else 0
 
-        return sum_of_unmarked * multiplier
+def win_order(parsed_input: Input) -> List[Win]:
+    """Every board that wins, in winning order (ties within one draw in board order)."""
+    # number -> (board, row counter slot, column counter slot) of every cell holding it
+    index: Dict[int, List[Tuple[int, int, int]]] = {}
+    unmarked_sums: List[int] = []
+    row_slots = 0
+    col_slots = 0
 
+    for board_id, board in enumerate(parsed_input.boards):
+        for row, numbers in enumerate(board):
+            for col, n in enumerate(numbers):
+                index.setdefault(n, []).append(
+                    (board_id, row_slots + row, col_slots + col))
 
-@ dataclass
-class Input:
-    drawn_numbers: List[int]
-    boards: List[Board]
+        unmarked_sums.append(sum(map(sum, board)))
+        row_slots += len(board)
+        col_slots += len(board[0])
 
+    heights = [len(board) for board in parsed_input.boards]
+    widths = [len(board[0]) for board in parsed_input.boards]
+    row_hits = [0] * row_slots
+    col_hits = [0] * col_slots
+    won_on_turn = [-1] * len(parsed_input.boards)
+    wins: List[Tuple[int, int, int]] = []
+    drawn: Set[int] = set()
 
-def parse_input(input: str) -> Input:
-    lines = input.splitlines()
-    drawnNumbers: List[int] = list(map(lambda s: int(s), lines[0].split(",")))
-    boards: List[Board] = []
+    for turn, number in enumerate(parsed_input.drawn_numbers):
+        # drawing a number again marks nothing new
+        if number in drawn:
+            continue
+        drawn.add(number)
 
-    for i in range(1, len(lines)):
-        if lines[i] == "":
-            boards.append(Board([]))
-        else:
-            boards[-1].matrix.append(list(map(lambda s: BoardNode(int(s.strip(' ')), False),
-                                              filter(lambda s: len(s) > 0, lines[i].split(' ')))))
+        for board_id, row_slot, col_slot in index.get(number, ()):
+            # a board that won on an earlier draw is frozen; one that just won
+            # still marks any other cell holding the same number
+            if won_on_turn[board_id] != -1 and won_on_turn[board_id] != turn:
+                continue
 
-    return Input(drawnNumbers, boards)
+            unmarked_sums[board_id] -= number
+            row_hits[row_slot] += 1
+            col_hits[col_slot] += 1
 
+            if won_on_turn[board_id] == -1 and (row_hits[row_slot] == widths[board_id] or
+                                                col_hits[col_slot] == heights[board_id]):
+                won_on_turn[board_id] = turn
+                wins.append((board_id, turn, number))
 
-def part1(input: str) -> str:
-    parsed_input = parse_input(input)
+    return [Win(board_id, turn, number, unmarked_sums[board_id] * number) for board_id, turn, number in wins]
 
-    for drawn_number in parsed_input.drawn_numbers:
-        for board in parsed_input.boards:
-            board.mark(drawn_number)
-            if board.has_bingo():
-                return str(board.get_score(drawn_number))
 
-    return "0"
+def win_turns(boards: np.ndarray, drawn_numbers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Turn each cell is marked on, shape (boards, rows, cols), and the turn each board wins on.
 
+    Unmarked cells and boards that never win get len(drawn_numbers).
+    """
+    never = len(drawn_numbers)
+    turn_of_number = np.full(max(int(boards.max(initial=0)), int(drawn_numbers.max(initial=0))) + 1,
+                             never, dtype=np.int64)
+    # a number drawn twice keeps its first turn
+    numbers, first_turns = np.unique(drawn_numbers, return_index=True)
+    turn_of_number[numbers] = first_turns
 
-def part2(input: str) -> str:
-    parsed_input = parse_input(input)
-    score = 0
+    cell_turns = turn_of_number[boards]
+    # a line is complete once its last number is drawn; a board wins with its first complete line
+    board_turns = np.minimum(cell_turns.max(axis=2).min(axis=1),
+                             cell_turns.max(axis=1).min(axis=1))
+
+    return cell_turns, board_turns
+
+
+@instrumented("first_and_last_win")
+def first_and_last_win(parsed_input: Input) -> List[Win]:
+    """Vectorized alternative to win_order() that only scores the first and last winner."""
+    if len(parsed_input.boards) == 0:
+        return []
+
+    # all boards must have the same shape to stack into one (boards, rows, cols) array
+    boards = np.array(parsed_input.boards, dtype=np.int64)
+    drawn_numbers = np.array(parsed_input.drawn_numbers, dtype=np.int64)
+    cell_turns, board_turns = win_turns(boards, drawn_numbers)
+    winners = np.flatnonzero(board_turns < len(drawn_numbers))
+
+    if len(winners) == 0:
+        return []
+
+    # ties go to the lower board id first, like in win_order()
+    first = int(winners[np.argmin(board_turns[winners])])
+    last_turn = board_turns[winners].max()
+    last = int(winners[board_turns[winners] == last_turn][-1])
 
-    for drawn_number in parsed_input.drawn_numbers:
-        for board in parsed_input.boards:
-            if not board.has_bingo():
-                board.mark(drawn_number)
-                if board.has_bingo():
-                    score = board.get_score(drawn_number)
+    def score(board_id: int) -> Win:
+        turn = int(board_turns[board_id])
+        number = int(drawn_numbers[turn])
+        unmarked = int(boards[board_id][cell_turns[board_id] > turn].sum())
 
-    return str(score)
+        return Win(board_id, turn, number, unmarked * number)
 
+    return [score(first), score(last)]
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def solve1(parsed_input: Input) -> str:
+    wins = first_and_last_win(parsed_input)
 
+    return str(wins[0].score) if len(wins) > 0 else "0"
 
-if __name__ == "__main__":
-    main()
+
+def solve2(parsed_input: Input) -> str:
+    wins = first_and_last_win(parsed_input)
+
+    return str(wins[-1].score) if len(wins) > 0 else "0"
+
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
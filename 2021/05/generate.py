@@ -0,0 +1,26 @@
+# Input generator for https://adventofcode.com/2021/day/5
+
+import random
+from typing import Iterator
+
+
+# size: number of vent lines on a `field` x `field` area; a third of them are diagonal
+def generate(size: int, seed: int = 0, field: int = 1000) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    for _ in range(0, size):
+        x1, y1 = rng.randrange(field), rng.randrange(field)
+        kind = rng.randrange(3)
+
+        if kind == 0:
+            x2, y2 = x1, rng.randrange(field)
+        elif kind == 1:
+            x2, y2 = rng.randrange(field), y1
+        else:
+            dx, dy = rng.choice([-1, 1]), rng.choice([-1, 1])
+            max_length = min(x1 if dx < 0 else field - 1 - x1,
+                             y1 if dy < 0 else field - 1 - y1)
+            length = rng.randint(0, max_length)
+            x2, y2 = x1 + dx * length, y1 + dy * length
+
+        yield f"{x1},{y1} -> {x2},{y2}"
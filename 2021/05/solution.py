@@ -1,123 +1,256 @@
 # https://adventofcode.com/2021/day/5
 
-import os
-import re
-from typing import Dict, List, NamedTuple
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import Dict, Iterator, List, NamedTuple, Set, Tuple
 
-Point = NamedTuple('Point', [('x', int), ('y', int)])
-Line = NamedTuple('Line', [('start', Point), ('end', Point)])
+import numpy as np
 
+from aoc.loader import Buffer, parse_ints
 
-def parse_input(input: str) -> List[Line]:
-    lines: List[Line] = []
-    pattern = r'(\d+),(\d+) -> (\d+),(\d+)'
+# at most this many points are generated per rasterization batch
+BATCH_POINTS = 1 << 22
+# each segment adds at most 1 to a cell, so uint16 counters clipped to 2 after
+# every batch of up to this many segments can never overflow
+BATCH_SEGMENTS = 1 << 15
+# the sparse engine takes over once segments are on average longer than this,
+# or the dense grid would need more than DENSE_MAX_CELLS counters
+SPARSE_MEAN_LENGTH = 1000
+DENSE_MAX_CELLS = 1 << 28
 
-    for strLine in input.splitlines():
-        matches = re.findall(pattern, strLine)[0]
+# A family of parallel lines: every point (x, y) lies on the line numbered
+# kx * x + ky * y and sits at position tx * x + ty * y along it.
+Family = NamedTuple('Family', [("key", Tuple[int, int]), ("position", Tuple[int, int])])
 
-        lines.append(Line(Point(int(matches[0]), int(matches[1])), Point(
-            int(matches[2]), int(matches[3]))))
+HORIZONTAL = Family((0, 1), (1, 0))
+VERTICAL = Family((1, 0), (0, 1))
+RISING = Family((1, -1), (1, 0))
+FALLING = Family((1, 1), (1, 0))
 
-    return lines
+# (start, end) position lists of the disjoint runs covered twice, per line
+Runs = Dict[int, Tuple[List[int], List[int]]]
 
 
-def part1(input: str) -> str:
-    lines = parse_input(input)
-    overlaps: Dict[int, Dict[int, int]] = {}
+# every vent line becomes one x1, y1, x2, y2 row of a (lines, 4) array
+def parse_buffer(buffer: Buffer) -> np.ndarray:
+    raw = np.frombuffer(buffer, dtype=np.uint8).copy()
+    raw[(raw < ord('0')) | (raw > ord('9'))] = ord(' ')
 
-    for line in lines:
-        if line.start.x == line.end.x:
-            for y in range(min(line.start.y, line.end.y), max(line.start.y, line.end.y) + 1):
-                if line.start.x not in overlaps:
-                    overlaps[line.start.x] = {}
+    return parse_ints(raw.tobytes()).reshape(-1, 4)
 
-                if y not in overlaps[line.start.x]:
-                    overlaps[line.start.x][y] = 0
 
-                overlaps[line.start.x][y] += 1
-        elif line.start.y == line.end.y:
-            for x in range(min(line.start.x, line.end.x), max(line.start.x, line.end.x) + 1):
-                if x not in overlaps:
-                    overlaps[x] = {}
+def parse(input: str) -> np.ndarray:
+    return parse_buffer(input.encode())
 
-                if line.start.y not in overlaps[x]:
-                    overlaps[x][line.start.y] = 0
 
-                overlaps[x][line.start.y] += 1
+def select(segments: np.ndarray, diagonals: bool) -> np.ndarray:
+    x1, y1, x2, y2 = segments.T
+    keep = (x1 == x2) | (y1 == y2)
 
-    answer = 0
+    if diagonals:
+        keep |= np.abs(x2 - x1) == np.abs(y2 - y1)
 
-    for x in overlaps:
-        for y in overlaps[x]:
-            if overlaps[x][y] > 1:
-                answer += 1
+    return segments[keep]
 
-    return str(answer)
 
+def rasterize(segments: np.ndarray, width: int) -> np.ndarray:
+    """Flat cell index (y * width + x) of every point on every segment."""
+    x1, y1, x2, y2 = segments.T
+    lengths = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
+    segment_ids = np.repeat(np.arange(len(segments)), lengths)
+    steps = np.arange(int(lengths.sum())) - \
+        np.repeat(np.cumsum(lengths) - lengths, lengths)
 
-def part2(input: str) -> str:
-    lines = parse_input(input)
-    overlaps: Dict[int, Dict[int, int]] = {}
+    xs = x1[segment_ids] + steps * np.sign(x2 - x1)[segment_ids]
+    ys = y1[segment_ids] + steps * np.sign(y2 - y1)[segment_ids]
+
+    return ys * width + xs
+
+
+def count_overlaps_dense(segments: np.ndarray, diagonals: bool) -> int:
+    """Cells covered by at least two segments, counted on a preallocated grid."""
+    segments = select(segments, diagonals)
+
+    if len(segments) == 0:
+        return 0
+
+    width = int(segments[:, [0, 2]].max()) + 1
+    height = int(segments[:, [1, 3]].max()) + 1
+    counts = np.zeros(width * height, dtype=np.uint16)
+
+    lengths = np.maximum(np.abs(segments[:, 2] - segments[:, 0]),
+                         np.abs(segments[:, 3] - segments[:, 1])) + 1
+    batch = int(max(1, min(BATCH_SEGMENTS, BATCH_POINTS // max(1, int(lengths.mean())))))
+
+    for start in range(0, len(segments), batch):
+        np.add.at(counts, rasterize(segments[start:start + batch], width), 1)
+        np.minimum(counts, 2, out=counts)
+
+    return int(np.count_nonzero(counts >= 2))
+
+
+def linear(form: Tuple[int, int], x: int, y: int) -> int:
+    return form[0] * x + form[1] * y
+
+
+def family_of(x1: int, y1: int, x2: int, y2: int) -> Family:
+    # single points count as horizontal
+    if y1 == y2:
+        return HORIZONTAL
+    if x1 == x2:
+        return VERTICAL
+
+    return RISING if (x2 - x1) * (y2 - y1) > 0 else FALLING
+
+
+def double_runs(intervals: List[Tuple[int, int, int]]) -> Tuple[Runs, int]:
+    """Runs covered by two or more collinear (line, start, end) intervals."""
+    events: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for line, start, end in intervals:
+        events[line].append((start, 1))
+        events[line].append((end + 1, -1))
+
+    runs: Runs = {}
+    total = 0
+
+    for line, changes in events.items():
+        changes.sort()
+        starts: List[int] = []
+        ends: List[int] = []
+        depth = 0
+
+        for position, change in changes:
+            if depth < 2 <= depth + change:
+                starts.append(position)
+            elif depth + change < 2 <= depth:
+                ends.append(position - 1)
+                total += position - starts[-1]
+            depth += change
+
+        if len(starts) > 0:
+            runs[line] = (starts, ends)
 
-    for line in lines:
-        # horizontal
-        if line.start.x == line.end.x:
-            for y in range(min(line.start.y, line.end.y), max(line.start.y, line.end.y) + 1):
-                if line.start.x not in overlaps:
-                    overlaps[line.start.x] = {}
+    return runs, total
 
-                if y not in overlaps[line.start.x]:
-                    overlaps[line.start.x][y] = 0
 
-                overlaps[line.start.x][y] += 1
-        # vertical
-        elif line.start.y == line.end.y:
-            for x in range(min(line.start.x, line.end.x), max(line.start.x, line.end.x) + 1):
-                if x not in overlaps:
-                    overlaps[x] = {}
+def crossings(across: List[Tuple[int, int, int]], along: List[Tuple[int, int, int]]) -> Iterator[Tuple[int, int]]:
+    """(u, v) of every crossing between (v, u1, u2) and (u, v1, v2) segments."""
+    # at equal u, segments are opened before and closed after the queries
+    events: List[Tuple[int, int, int, int]] = []
+    for v, u1, u2 in across:
+        events.append((u1, 0, v, v))
+        events.append((u2, 2, v, v))
+    for u, v1, v2 in along:
+        events.append((u, 1, v1, v2))
+    events.sort()
 
-                if line.start.y not in overlaps[x]:
-                    overlaps[x][line.start.y] = 0
+    active: List[int] = []
 
-                overlaps[x][line.start.y] += 1
-        # diagonal
-        elif abs(line.start.x - line.end.x) == abs(line.start.y - line.end.y):
-            min_x_point = line.start if line.start.x < line.end.x else line.end
-            max_x_point = line.end if line.start.x < line.end.x else line.start
+    for u, kind, v1, v2 in events:
+        if kind == 0:
+            insort(active, v1)
+        elif kind == 2:
+            del active[bisect_left(active, v1)]
+        else:
+            for v in active[bisect_left(active, v1):bisect_right(active, v2)]:
+                yield u, v
 
-            for x in range(min_x_point.x, max_x_point.x + 1):
-                distance = x - min_x_point.x
-                y = min_x_point.y + distance * \
-                    (1 if max_x_point.y > min_x_point.y else -1)
 
-                if x not in overlaps:
-                    overlaps[x] = {}
+def covered_twice(runs: Runs, family: Family, x: int, y: int) -> bool:
+    line = runs.get(linear(family.key, x, y))
+    if line is None:
+        return False
 
-                if y not in overlaps[x]:
-                    overlaps[x][y] = 0
+    starts, ends = line
+    position = linear(family.position, x, y)
+    i = bisect_right(starts, position) - 1
 
-                overlaps[x][y] += 1
+    return i >= 0 and position <= ends[i]
 
-    answer = 0
 
-    for x in overlaps:
-        for y in overlaps[x]:
-            if overlaps[x][y] > 1:
-                answer += 1
+def count_overlaps_sparse(segments: np.ndarray, diagonals: bool) -> int:
+    """Cells covered by at least two segments, counted without visiting them.
 
-    return str(answer)
+    Collinear overlaps are measured as runs along each line; the only other
+    cells covered twice are crossings between lines of different families.
+    The cost grows with the number of segments and crossings, not with the
+    segments' lengths or coordinates.
+    """
+    grouped: Dict[Family, List[Tuple[int, int, int, int]]] = defaultdict(list)
+    for x1, y1, x2, y2 in select(segments, diagonals).tolist():
+        grouped[family_of(x1, y1, x2, y2)].append((x1, y1, x2, y2))
 
+    families = list(grouped)
+    runs: Dict[Family, Runs] = {}
+    total = 0
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
+    for family in families:
+        intervals = []
+        for x1, y1, x2, y2 in grouped[family]:
+            start, end = linear(family.position, x1, y1), linear(family.position, x2, y2)
+            intervals.append((linear(family.key, x1, y1), min(start, end), max(start, end)))
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+        runs[family], length = double_runs(intervals)
+        total += length
 
+    points: Set[Tuple[int, int]] = set()
 
-if __name__ == "__main__":
-    main()
+    for i, first in enumerate(families):
+        for second in families[i + 1:]:
+            # crossing lines are found in (second line, first line) coordinates;
+            # rising and falling diagonals only meet on a cell when their line
+            # numbers have the same parity
+            (ax, ay), (bx, by) = first.key, second.key
+            determinant = ax * by - ay * bx
+
+            across = [(linear(first.key, x1, y1),
+                       min(linear(second.key, x1, y1), linear(second.key, x2, y2)),
+                       max(linear(second.key, x1, y1), linear(second.key, x2, y2)))
+                      for x1, y1, x2, y2 in grouped[first]]
+            along = [(linear(second.key, x1, y1),
+                      min(linear(first.key, x1, y1), linear(first.key, x2, y2)),
+                      max(linear(first.key, x1, y1), linear(first.key, x2, y2)))
+                     for x1, y1, x2, y2 in grouped[second]]
+
+            for u, v in crossings(across, along):
+                x, remainder = divmod(v * by - ay * u, determinant)
+                if remainder == 0:
+                    points.add((x, (ax * u - v * bx) // determinant))
+
+    # a crossing may already lie on runs counted above, once per family
+    for x, y in points:
+        total += 1 - sum(covered_twice(runs[family], family, x, y) for family in families)
+
+    return total
+
+
+def count_overlaps(segments: np.ndarray, diagonals: bool) -> int:
+    selected = select(segments, diagonals)
+
+    if len(selected) == 0:
+        return 0
+
+    lengths = np.maximum(np.abs(selected[:, 2] - selected[:, 0]),
+                         np.abs(selected[:, 3] - selected[:, 1])) + 1
+    cells = (int(selected[:, [0, 2]].max()) + 1) * (int(selected[:, [1, 3]].max()) + 1)
+
+    if int(lengths.sum()) > SPARSE_MEAN_LENGTH * len(selected) or cells > DENSE_MAX_CELLS:
+        return count_overlaps_sparse(selected, diagonals)
+
+    return count_overlaps_dense(selected, diagonals)
+
+
+def solve1(segments: np.ndarray) -> str:
+    return str(count_overlaps(segments, diagonals=False))
+
+
+def solve2(segments: np.ndarray) -> str:
+    return str(count_overlaps(segments, diagonals=True))
+
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
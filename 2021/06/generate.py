@@ -0,0 +1,11 @@
+# Input generator for https://adventofcode.com/2021/day/6
+
+import random
+from typing import Iterator
+
+
+# size: number of lanternfish
+def generate(size: int, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    yield ','.join(str(rng.randint(1, 5)) for _ in range(0, size))
@@ -1,61 +1,116 @@
 # https://adventofcode.com/2021/day/6
 
-from functools import reduce
-import os
 from math import floor
 from pathlib import Path
-from typing import Dict, List, NamedTuple
+from typing import Iterable, List, NamedTuple, Optional
 
 Day = NamedTuple("Day", [("total_fish", int), ("new_fish", int)])
 
+Matrix = List[List[int]]
+TIMERS = 9
 
-def parse_input(input: str) -> List[int]:
+
+def transition() -> Matrix:
+    # row vector convention: counts[t] after a day = sum(counts[s] * matrix[s][t])
+    matrix = [[0] * TIMERS for _ in range(0, TIMERS)]
+
+    for timer in range(1, TIMERS):
+        matrix[timer][timer - 1] = 1
+
+    matrix[0][6] = 1
+    matrix[0][8] = 1
+
+    return matrix
+
+
+def parse(input: str) -> List[int]:
     return list(map(lambda s: int(s), input.split(',')))
 
 
+# day-by-day reference for population(): one count per timer value 0..8
 def simulate(fish_initial_days_left: List[int], total_days: int) -> int:
-    new_fish_by_day: Dict[int, int] = {}
-    fish_count_by_7_remainder: Dict[int, int] = {
-        0: 0,
-        1: 0,
-        2: 0,
-        3: 0,
-        4: 0,
-        5: 0,
-        6: 0
-    }
+    counts = timer_counts(fish_initial_days_left)
+
+    for _ in range(0, total_days):
+        spawning = counts[0]
+        counts = counts[1:] + [spawning]
+        counts[6] += spawning
+
+    return sum(counts)
+
+
+def multiply(a: Matrix, b: Matrix, modulus: Optional[int]) -> Matrix:
+    product = [[sum(a[i][k] * b[k][j] for k in range(0, TIMERS)) for j in range(0, TIMERS)]
+               for i in range(0, TIMERS)]
+
+    if modulus is not None:
+        product = [[value % modulus for value in row] for row in product]
+
+    return product
+
+
+def advance(counts: List[int], matrix: Matrix, modulus: Optional[int]) -> List[int]:
+    advanced = [sum(counts[s] * matrix[s][t] for s in range(0, TIMERS)) for t in range(0, TIMERS)]
+
+    if modulus is not None:
+        advanced = [value % modulus for value in advanced]
+
+    return advanced
+
+
+def timer_counts(fish_initial_days_left: List[int]) -> List[int]:
+    counts = [0] * TIMERS
 
     for days_left in fish_initial_days_left:
-        fish_count_by_7_remainder[(days_left + 1) % 7] += 1
+        counts[days_left] += 1
 
-    for day in range(0, total_days + 1):
-        new_fish_by_day[day] = fish_count_by_7_remainder[day % 7]
+    return counts
 
-        if day >= 8:
-            fish_count_by_7_remainder[(day + 8) %
-                                      7] += new_fish_by_day[day - 8]
 
-    return len(fish_initial_days_left) + reduce(lambda sum, n: sum + n, new_fish_by_day.values(), 0)
+def populations(fish_initial_days_left: List[int], horizons: Iterable[int], modulus: Optional[int] = None) -> List[int]:
+    """Number of fish after each horizon, optionally modulo `modulus`.
 
+    The transition matrix is squared once per bit of the largest horizon and
+    those powers are shared by every query, so each horizon only costs one
+    vector-matrix product per set bit.  Without a modulus the counts grow
+    exponentially, so horizons much beyond a few million days need one.
+    """
+    horizons = list(horizons)
+    counts = timer_counts(fish_initial_days_left)
+    powers = [transition()]
 
-def part1(input: str) -> str:
-    return str(simulate(parse_input(input), 80))
+    while (1 << len(powers)) <= max(horizons, default=0):
+        powers.append(multiply(powers[-1], powers[-1], modulus))
 
+    totals: List[int] = []
 
-def part2(input: str) -> str:
-    return str(simulate(parse_input(input), 256))
+    for days in horizons:
+        state = counts if modulus is None else [count % modulus for count in counts]
+
+        for bit, power in enumerate(powers):
+            if days >> bit & 1:
+                state = advance(state, power, modulus)
+
+        totals.append(sum(state) if modulus is None else sum(state) % modulus)
+
+    return totals
 
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
+def population(fish_initial_days_left: List[int], days: int, modulus: Optional[int] = None) -> int:
+    return populations(fish_initial_days_left, [days], modulus)[0]
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
 
+def solve1(fish_initial_days_left: List[int]) -> str:
+    return str(population(fish_initial_days_left, 80))
 
-if __name__ == "__main__":
-    main()
+
+def solve2(fish_initial_days_left: List[int]) -> str:
+    return str(population(fish_initial_days_left, 256))
+
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
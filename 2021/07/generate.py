@@ -0,0 +1,11 @@
+# Input generator for https://adventofcode.com/2021/day/7
+
+import random
+from typing import Iterator
+
+
+# size: number of crabs, positioned in range(spread)
+def generate(size: int, seed: int = 0, spread: int = 2000) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    yield ','.join(str(rng.randrange(spread)) for _ in range(0, size))
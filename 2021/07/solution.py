@@ -1,44 +1,105 @@
 # https://adventofcode.com/2021/day/7
 
-from functools import reduce
-from math import ceil, floor
-import os
-from typing import List
+from typing import Callable, Tuple
+from typing_extensions import NamedTuple
 
+import numpy as np
 
-def parse_input(input: str) -> List[int]:
-    return list(map(lambda s: int(s), input.split(',')))
+from aoc.loader import Buffer, parse_ints
 
+# Histogram of crab positions offset by `lowest`, with prefix sums over it:
+# counts[i], sums[i] and squares[i] cover the crabs at positions below
+# lowest + i, so any range of positions is summarised by two lookups.
+CostIndex = NamedTuple('CostIndex', [("lowest", int), ("counts", np.ndarray),
+                                     ("sums", np.ndarray), ("squares", np.ndarray)])
 
-def part1(input: str) -> str:
-    positions = parse_input(input)
-    positions.sort()
-    align_to = positions[floor(len(positions) / 2)]
 
-    return str(reduce(lambda sum, n: sum + abs(n - align_to), positions, 0))
+def parse_buffer(buffer: Buffer) -> np.ndarray:
+    raw = np.frombuffer(buffer, dtype=np.uint8).copy()
+    raw[raw == ord(',')] = ord(' ')
 
+    return parse_ints(raw.tobytes())
+
+
+def parse(input: str) -> np.ndarray:
+    return parse_buffer(input.encode())
+
+
+def build_index(positions: np.ndarray) -> CostIndex:
+    lowest = int(positions.min())
+    histogram = np.bincount(positions - lowest).astype(np.int64)
+    farthest = max(abs(lowest), abs(int(positions.max())))
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        return np.concatenate((np.zeros(1, dtype=values.dtype), np.cumsum(values)))
+
+    # the sums of squares stay exact in int64 only while n * max|position|^2
+    # fits; beyond that they are accumulated as Python ints
+    exact = np.int64 if len(positions) * farthest * farthest < 2 ** 63 else object
+    weights = histogram.astype(exact)
+    offsets = np.arange(len(histogram), dtype=np.int64).astype(exact) + lowest
+
+    return CostIndex(lowest, prefix(histogram), prefix(weights * offsets),
+                     prefix(weights * offsets * offsets))
+
+
+def split(index: CostIndex, target: int) -> Tuple[int, int, int, int, int]:
+    # (count, sum) of the crabs at or left of target, and totals over all crabs
+    i = min(max(target - index.lowest + 1, 0), len(index.counts) - 1)
+
+    return (int(index.counts[i]), int(index.sums[i]),
+            int(index.counts[-1]), int(index.sums[-1]), int(index.squares[-1]))
+
+
+def linear_cost(index: CostIndex, target: int) -> int:
+    left, left_sum, total, total_sum, _ = split(index, target)
+
+    return (target * left - left_sum) + (total_sum - left_sum) - target * (total - left)
 
-def part2(input: str) -> str:
-    positions = parse_input(input)
-    # align to avg, optimise for least movement
-    align_to = reduce(lambda sum, n: sum + n,
-                      positions, 0) / len(positions)
-    align_to_ceiled = ceil(align_to)
-    align_to_floored = floor(align_to)
 
-    return str(min(reduce(lambda sum, n: sum + floor(abs(n - align_to_ceiled) * (abs(n - align_to_ceiled) + 1) / 2), positions, 0), (reduce(lambda sum, n: sum + floor(abs(n - align_to_floored) * (abs(n - align_to_floored) + 1) / 2), positions, 0))))
+def triangular_cost(index: CostIndex, target: int) -> int:
+    # sum of d * (d + 1) / 2 over distances d is (sum of d^2 + sum of d) / 2
+    _, _, total, total_sum, total_squares = split(index, target)
+    squared = total_squares - 2 * target * total_sum + target * target * total
 
+    return (squared + linear_cost(index, target)) // 2
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def median(index: CostIndex) -> int:
+    # lower median: the crab at rank (n - 1) // 2
+    rank = (int(index.counts[-1]) - 1) // 2
 
+    return index.lowest + int(np.searchsorted(index.counts, rank, side='right')) - 1
 
-if __name__ == "__main__":
-    main()
+
+def minimize(cost: Callable[[int], int], low: int, high: int) -> int:
+    """Smallest value of a convex integer cost on [low, high], by ternary search."""
+    while high - low > 2:
+        third = (high - low) // 3
+        if cost(low + third) <= cost(high - third):
+            high = high - third
+        else:
+            low = low + third
+
+    return min(cost(target) for target in range(low, high + 1))
+
+
+def solve1(positions: np.ndarray) -> str:
+    index = build_index(positions)
+
+    return str(linear_cost(index, median(index)))
+
+
+def solve2(positions: np.ndarray) -> str:
+    index = build_index(positions)
+    highest = index.lowest + len(index.counts) - 2
+
+    return str(minimize(lambda target: triangular_cost(index, target), index.lowest, highest))
+
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,30 @@
+# Input generator for https://adventofcode.com/2021/day/8
+
+import random
+from typing import Dict, Iterator
+
+wires = "abcdefg"
+digit_segments = ["abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                  "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+
+
+def scramble(rng: random.Random, segments: str, wiring: Dict[str, str]) -> str:
+    pattern = [wiring[segment] for segment in segments]
+    rng.shuffle(pattern)
+
+    return ''.join(pattern)
+
+
+# size: number of notes, each with its own random wiring
+def generate(size: int, seed: int = 0) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    for _ in range(0, size):
+        wiring = dict(zip(wires, rng.sample(wires, len(wires))))
+        signal_patterns = [scramble(rng, segments, wiring)
+                           for segments in digit_segments]
+        rng.shuffle(signal_patterns)
+        output_value_digits = [scramble(rng, rng.choice(digit_segments), wiring)
+                               for _ in range(0, 4)]
+
+        yield ' '.join(signal_patterns) + ' | ' + ' '.join(output_value_digits)
@@ -1,170 +1,125 @@
 # https://adventofcode.com/2021/day/8
 
-import copy
-from functools import reduce
+import multiprocessing
 import os
-from typing import Dict, List, NamedTuple, Literal, Set, Union
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 
-DisplaySegmentPosition = Literal['top', 'bottom', "middle",
-                                 'top-left', 'top-right', 'bottom-left', 'bottom-right']
+import numpy as np
 
+from aoc.loader import Buffer
 
-Note = NamedTuple(
-    "Note", [("signal_patterns", List[str]), ("output_value_digits", List[str])])
+PATTERNS = 10
+OUTPUTS = 4
+# notes decoded per vectorised step, bounding the temporary arrays
+BATCH_NOTES = 1 << 18
+# notes per worker task; at 14 bytes a note, shipping a chunk to a worker costs
+# far less than decoding it
+CHUNK_NOTES = 1 << 20
+# solve2 only starts a process pool for logs of at least this many notes
+PARALLEL_NOTES = 4 * CHUNK_NOTES
 
+DIGIT_SEGMENTS = ["abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                  "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
 
-def parse_input(input: str) -> List[Note]:
-    notes: List[Note] = []
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(0, 128)], dtype=np.uint8)
 
-    for line in input.splitlines():
-        parts = line.split(' | ')
-        notes.append(Note(list(map(lambda s: ''.join(sorted(list(s))), parts[0].split(' '))),
-                     list(map(lambda s: ''.join(sorted(list(s))), parts[1].split(' ')))))
 
-    return notes
+def to_mask(pattern: str) -> int:
+    return sum(1 << (ord(wire) - ord('a')) for wire in pattern)
 
 
-def part1(input: str) -> str:
-    notes = parse_input(input)
-    answer = 0
+def fingerprints() -> np.ndarray:
+    # A wire's frequency is how many of the ten patterns light it, and a
+    # digit's fingerprint is the sum of its wires' frequencies.  Frequencies do
+    # not depend on how the wires are crossed and the ten fingerprints are
+    # distinct, so the table maps fingerprints straight back to digits.
+    masks = [to_mask(segments) for segments in DIGIT_SEGMENTS]
+    table = np.full(PATTERNS * 7 + 1, -1, dtype=np.int8)
 
-    for note in notes:
-        for digit in note.output_value_digits:
-            if len(digit) == 2 or len(digit) == 4 or len(digit) == 3 or len(digit) == 7:
-                answer += 1
+    for digit, mask in enumerate(masks):
+        table[sum(bin(mask & other).count('1') for other in masks)] = digit
 
-    return str(answer)
+    return table
 
 
-def part2(input: str) -> str:
-    notes = parse_input(input)
-    answer = 0
-
-    for note in notes:
-        segments: Dict[DisplaySegmentPosition, str] = {
-            "top-left": "",
-            "top-right": "",
-            "top": "",
-            "middle": "",
-            "bottom-left": "",
-            "bottom-right": "",
-            "bottom": ""
-        }
-        digit_patterns: Dict[int, Set[str]] = {
-            0: set([]),
-            1: set([]),
-            2: set([]),
-            3: set([]),
-            4: set([]),
-            5: set([]),
-            6: set([]),
-            7: set([]),
-            8: set([]),
-            9: set([])
-        }
-
-        signal_patterns_by_len: Dict[int, List[Set[str]]] = {}
-
-        for pattern in note.signal_patterns:
-            if len(pattern) not in signal_patterns_by_len:
-                signal_patterns_by_len[len(pattern)] = []
-
-            signal_patterns_by_len[len(pattern)].append(set(pattern))
-
-        digit_patterns[1] = signal_patterns_by_len[2][0]
-        digit_patterns[4] = signal_patterns_by_len[4][0]
-        digit_patterns[7] = signal_patterns_by_len[3][0]
-        digit_patterns[8] = signal_patterns_by_len[7][0]
-
-        # diff 7 with 1 to get top
-        segments["top"] = list(digit_patterns[7].difference(
-            digit_patterns[1]))[0]
-
-        # diff 6-length patterns (0, 6, 9) with 8; if the diff is in 1 -> that's the top-right wire id
-        # we've also found digit_patterns[6]
-        for p in signal_patterns_by_len[6]:
-            diff = list(digit_patterns[8].difference(p))[0]
-
-            if diff in digit_patterns[1]:
-                segments["top-right"] = diff
-                digit_patterns[6] = p
-
-        # get bottom-right by excluding top-right from 1
-        segments["bottom-right"] = list(
-            digit_patterns[1].difference(set(segments['top-right'])))[0]
-
-        # find 5 by finding the 5-length pattern that does not include our known top-right wire
-        digit_patterns[5] = list(filter(
-            lambda pattern: segments["top-right"] not in pattern, signal_patterns_by_len[5]))[0]
-
-        # now get bottom-left by diffing 6 and 5
-        segments["bottom-left"] = list(
-            digit_patterns[6].difference(digit_patterns[5]))[0]
-
-        # now find 9 and 0.
-        # 9 is found by diffing with 5. 9 will have only one diff = top-right wire
-        # then the other two possibilities are 6 and 0. We already know 6, so by exclusion..
-        for p in signal_patterns_by_len[6]:
-            difference = list(p.difference(digit_patterns[5]))
-
-            if len(difference) == 1 and difference[0] == segments['top-right']:
-                digit_patterns[9] = p
-            elif p != digit_patterns[6]:
-                digit_patterns[0] = p
-
-        # now get middle by diffing 8 and 0
-        segments["middle"] = list(
-            digit_patterns[8].difference(digit_patterns[0]))[0]
-
-        # now get top-left by diffing 4 with the known middle, top-right, bottom-right
-        segments["top-left"] = list(
-            digit_patterns[4].difference(
-                set([segments["top-right"], segments["bottom-right"], segments["middle"]]))
-        )[0]
-
-        # find 3 and 2.
-        # Find 3 by diffing with 9. If there's only one diff -> that's 3
-        # Then there's two 5-length patterns left - 5 and 2. We know 5, so by exclusion we find 2..
-        for p in signal_patterns_by_len[5]:
-            difference = list(digit_patterns[9].difference(p))
-
-            if len(difference) == 1 and p != digit_patterns[5]:
-                digit_patterns[3] = p
-            elif p != digit_patterns[5]:
-                digit_patterns[2] = p
-
-        # finally, get bottom by diffing 8 with everything else we know
-        segments["bottom"] = list(
-            digit_patterns[8].difference(set(segments.values()))
-        )[0]
-
-        # now for the output number..
-        output_value_str = ""
-
-        for output_value_digit in note.output_value_digits:
-            output_value_digit_charset = set(output_value_digit)
-
-            for digit in digit_patterns:
-                if output_value_digit_charset == digit_patterns[digit]:
-                    output_value_str += str(digit)
-                    break
-
-        answer += int(output_value_str)
-
-    return str(answer)
-
-
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
+FINGERPRINT_DIGITS = fingerprints()
+
+
+# every note becomes a row of 14 seven-bit wire masks, the ten signal patterns
+# then the four outputs
+def parse_buffer(buffer: Buffer) -> np.ndarray:
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    is_wire = (raw >= ord('a')) & (raw <= ord('g'))
+    wires = np.flatnonzero(is_wire)
+
+    if len(wires) == 0:
+        return np.empty((0, PATTERNS + OUTPUTS), dtype=np.uint8)
+
+    starts = np.flatnonzero(~is_wire[wires - 1] | (wires == 0))
+    bits = np.left_shift(1, raw[wires] - ord('a')).astype(np.uint8)
+
+    return np.add.reduceat(bits, starts).astype(np.uint8).reshape(-1, PATTERNS + OUTPUTS)
+
+
+def parse(input: str) -> np.ndarray:
+    return parse_buffer(input.encode())
+
+
+def decode(notes: np.ndarray) -> np.ndarray:
+    """Four-digit output value of every note."""
+    values = np.empty(len(notes), dtype=np.int64)
+    place = np.array([1000, 100, 10, 1], dtype=np.int64)
+
+    for start in range(0, len(notes), BATCH_NOTES):
+        batch = notes[start:start + BATCH_NOTES]
+        patterns, outputs = batch[:, None, :PATTERNS], batch[:, PATTERNS:, None]
+        # summing the wires an output shares with each pattern adds up the
+        # frequencies of its wires
+        scores = POPCOUNT[patterns & outputs].sum(axis=2, dtype=np.int64)
+        values[start:start + BATCH_NOTES] = FINGERPRINT_DIGITS[scores] @ place
+
+    return values
+
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def decode_sum(notes: np.ndarray) -> int:
+    return int(decode(notes).sum())
 
 
-if __name__ == "__main__":
-    main()
+def decode_parallel(notes: np.ndarray, jobs: Optional[int] = None, chunk_notes: int = CHUNK_NOTES) -> int:
+    """Sum of all output values, with chunks of notes decoded across a process pool."""
+    jobs = jobs if jobs is not None else os.cpu_count() or 1
+    chunks = [notes[start:start + chunk_notes] for start in range(0, len(notes), chunk_notes)]
+
+    # decode_sum is pickled by the name aoc.runner registered this module
+    # under, which only a forked child can resolve; spawn and forkserver
+    # workers would fail to import it, so without fork everything runs here
+    if jobs <= 1 or len(chunks) <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return decode_sum(notes)
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)),
+                             mp_context=multiprocessing.get_context('fork')) as pool:
+        return sum(pool.map(decode_sum, chunks))
+
+
+def solve1(notes: np.ndarray) -> str:
+    # 1, 4, 7 and 8 are the only digits with 2, 4, 3 and 7 wires
+    lengths = POPCOUNT[notes[:, PATTERNS:]]
+
+    return str(int(np.isin(lengths, (2, 3, 4, 7)).sum()))
+
+
+def solve2(notes: np.ndarray) -> str:
+    # inside a worker of `aoc.runner --jobs N` the cores are already taken
+    if len(notes) >= PARALLEL_NOTES and multiprocessing.parent_process() is None:
+        return str(decode_parallel(notes))
+
+    return str(decode_sum(notes))
+
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
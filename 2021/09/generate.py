@@ -0,0 +1,51 @@
+# Input generator for https://adventofcode.com/2021/day/9
+
+import random
+from collections import deque
+from math import isqrt
+from typing import Iterator, List, Optional
+
+
+# size: number of cells (a square grid unless width/height are given)
+#
+# Cells are 9 with probability `walls`; every other region is shaped as a bowl
+# around one random cell, so each basin has exactly one low point like the
+# real puzzle inputs.
+def generate(size: int, seed: int = 0, width: Optional[int] = None, height: Optional[int] = None, walls: float = 0.45) -> Iterator[str]:
+    rng = random.Random(seed)
+    width = width or max(1, isqrt(size))
+    height = height or max(1, size // width)
+
+    matrix: List[List[int]] = [[9 if rng.random() < walls else -1 for _ in range(0, width)]
+                               for _ in range(0, height)]
+
+    for row in range(0, height):
+        for col in range(0, width):
+            if matrix[row][col] != -1:
+                continue
+
+            # collect the region, then pick its low point
+            region = [(row, col)]
+            matrix[row][col] = -2
+            i = 0
+            while i < len(region):
+                r, c = region[i]
+                i += 1
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < height and 0 <= nc < width and matrix[nr][nc] == -1:
+                        matrix[nr][nc] = -2
+                        region.append((nr, nc))
+
+            low_point = rng.choice(region)
+            matrix[low_point[0]][low_point[1]] = 0
+            queue = deque([low_point])
+
+            while len(queue) > 0:
+                r, c = queue.popleft()
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < height and 0 <= nc < width and matrix[nr][nc] == -2:
+                        matrix[nr][nc] = min(8, matrix[r][c] + 1)
+                        queue.append((nr, nc))
+
+    for line in matrix:
+        yield ''.join(map(str, line))
@@ -1,126 +1,155 @@
 # https://adventofcode.com/2021/day/9
 
-from functools import reduce
-import operator
-import os
-from typing import Dict, List, Literal, TypedDict, Union
+from typing import List, Optional, Tuple
+from typing_extensions import NamedTuple
 
-Point2D = TypedDict('Point2D', {"row": int, "col": int})
-Direction = Literal['up', 'right', 'down', 'left']
+import numpy as np
 
+from aoc.instrument import instrumented
+from aoc.loader import Buffer
 
-def parse_input(input: str) -> List[List[int]]:
-    matrix: List[List[int]] = []
+WALL = 9
+# rows per band when scanning a mapped height map; a band of a 100k-wide map
+# is then about 400 MB of bytes plus its boolean masks
+BAND_ROWS = 4096
 
-    for line in input.splitlines():
-        matrix.append([])
-        for c in line:
-            matrix[-1].append(int(c))
+# coordinates is a (points, 2) array of (row, col), when asked for
+LowPoints = NamedTuple('LowPoints', [("risk", int), ("coordinates", Optional[np.ndarray])])
 
-    return matrix
 
+# the height map becomes a (rows, cols) uint8 array
+def parse_buffer(buffer: Buffer) -> np.ndarray:
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    digits = raw[(raw >= ord('0')) & (raw <= ord('9'))] - ord('0')
+    newlines = np.flatnonzero(raw == ord('\n'))
+    first_line = raw[:newlines[0] if len(newlines) > 0 else len(raw)]
+    width = int(np.count_nonzero((first_line >= ord('0')) & (first_line <= ord('9'))))
 
-def get_matrix_point_at_direction(matrix: List[List[int]], point: Point2D, direction: Direction) -> Union[Point2D, None]:
-    if direction == 'up':
-        return Point2D(row=point["row"] - 1, col=point["col"]) if point["row"] > 0 else None
-    elif direction == 'right':
-        return Point2D(row=point["row"], col=point["col"] + 1) if point["col"] < len(matrix[0]) - 1 else None
-    elif direction == 'down':
-        return Point2D(row=point["row"] + 1, col=point["col"]) if point["row"] < len(matrix) - 1 else None
-    elif direction == 'left':
-        return Point2D(row=point["row"], col=point["col"] - 1) if point["col"] > 0 else None
+    if width == 0:
+        return np.empty((0, 0), dtype=np.uint8)
 
+    return digits.reshape(-1, width)
 
-def is_low_point(matrix: List[List[int]], point: Point2D) -> bool:
-    value = matrix[point["row"]][point["col"]]
-    up = get_matrix_point_at_direction(matrix, point, "up")
-    right = get_matrix_point_at_direction(matrix, point, "right")
-    down = get_matrix_point_at_direction(matrix, point, "down")
-    left = get_matrix_point_at_direction(matrix, point, "left")
 
-    return ((up is None or value < matrix[up["row"]][up["col"]]) and
-            (right is None or value < matrix[right["row"]][right["col"]]) and
-            (down is None or value < matrix[down["row"]][down["col"]]) and
-            (left is None or value < matrix[left["row"]][left["col"]]))
+def parse(input: str) -> np.ndarray:
+    return parse_buffer(input.encode())
 
-# returns size of basin
 
+def low_point_mask(heights: np.ndarray) -> np.ndarray:
+    """Cells lower than each of their (up to four) neighbours."""
+    low = np.ones(heights.shape, dtype=bool)
 
-Context = TypedDict(
-    'Context', {'count': int, "visited": Dict[int, Dict[int, bool]]})
+    low[1:, :] &= heights[1:, :] < heights[:-1, :]
+    low[:-1, :] &= heights[:-1, :] < heights[1:, :]
+    low[:, 1:] &= heights[:, 1:] < heights[:, :-1]
+    low[:, :-1] &= heights[:, :-1] < heights[:, 1:]
 
+    return low
 
-def discover_basin(matrix: List[List[int]], point: Point2D, context: Context):
-    if matrix[point["row"]][point["col"]] == 9:
-        return
 
-    if point["row"] in context["visited"] and point["col"] in context["visited"][point["row"]]:
-        return
+def scan(heights: np.ndarray, coordinates: bool = False) -> LowPoints:
+    low = low_point_mask(heights)
+    risk = int(heights[low].sum(dtype=np.int64)) + int(np.count_nonzero(low))
 
-    if point["row"] not in context["visited"]:
-        context["visited"][point["row"]] = {}
+    return LowPoints(risk, np.argwhere(low) if coordinates else None)
 
-    context["visited"][point["row"]][point["col"]] = True
 
-    context["count"] += 1
+def scan_tiled(buffer: Buffer, band_rows: int = BAND_ROWS, coordinates: bool = False) -> LowPoints:
+    """scan() over a raw height map file, one band of rows at a time.
 
-    up = get_matrix_point_at_direction(matrix, point, "up")
-    if up is not None:
-        discover_basin(matrix, up, context)
+    The buffer is typically InputFile.view() of a map too large to parse
+    whole; only one band (plus a halo row on each side) is ever decoded, so
+    memory stays bounded by band_rows times the row width.  Every line must
+    have the same length and ending.
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    newlines = np.flatnonzero(raw[:min(len(raw), 1 << 24)] == ord('\n'))
+    stride = int(newlines[0]) + 1 if len(newlines) > 0 else len(raw)
+    first_line = raw[:stride]
+    width = int(np.count_nonzero((first_line >= ord('0')) & (first_line <= ord('9'))))
 
-    right = get_matrix_point_at_direction(matrix, point, "right")
-    if right is not None:
-        discover_basin(matrix, right, context)
+    if width == 0:
+        return LowPoints(0, np.empty((0, 2), dtype=np.int64) if coordinates else None)
 
-    down = get_matrix_point_at_direction(matrix, point, "down")
+    # the last line may have no line ending
+    rows = len(raw) // stride + (1 if len(raw) % stride >= width else 0)
 
-    if down is not None:
-        discover_basin(matrix, down, context)
+    def band(start: int, end: int) -> np.ndarray:
+        chunk = raw[start * stride:end * stride]
+        if len(chunk) < (end - start) * stride:
+            chunk = np.concatenate((chunk, np.zeros((end - start) * stride - len(chunk), dtype=np.uint8)))
 
-    left = get_matrix_point_at_direction(matrix, point, "left")
-    if left is not None:
-        discover_basin(matrix, left, context)
+        return chunk.reshape(-1, stride)[:, :width] - ord('0')
 
+    risk = 0
+    found: List[np.ndarray] = []
 
-def part1(input: str) -> str:
-    matrix = parse_input(input)
-    risk_levels_sum = 0
+    for start in range(0, rows, band_rows):
+        end = min(rows, start + band_rows)
+        halo_start, halo_end = max(0, start - 1), min(rows, end + 1)
+        halo = band(halo_start, halo_end)
+        low = low_point_mask(halo)[start - halo_start:end - halo_start]
+        heights = halo[start - halo_start:end - halo_start]
 
-    for row in range(0, len(matrix)):
-        for col in range(0, len(matrix[row])):
-            if is_low_point(matrix, Point2D(row=row, col=col)):
-                risk_levels_sum += 1 + matrix[row][col]
+        risk += int(heights[low].sum(dtype=np.int64)) + int(np.count_nonzero(low))
+        if coordinates:
+            found.append(np.argwhere(low) + (start, 0))
 
-    return str(risk_levels_sum)
+    return LowPoints(risk, np.concatenate(found) if coordinates else None)
 
 
-def part2(input: str) -> str:
-    matrix = parse_input(input)
-    basin_sizes: List[int] = []
+@instrumented("label_basins")
+def label_basins(heights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Basin id of every cell (-1 for walls) and the size of every basin.
+
+    Basins are the connected regions of non-9 cells, labelled in one pass over
+    the flattened grid with an explicit-stack flood fill.
+    """
+    rows, cols = heights.shape
+    cells: List[int] = heights.ravel().tolist()
+    labels: List[int] = [-1] * len(cells)
+    sizes: List[int] = []
+
+    for start in range(0, len(cells)):
+        if cells[start] == WALL or labels[start] != -1:
+            continue
+
+        basin = len(sizes)
+        labels[start] = basin
+        stack = [start]
+        size = 0
+
+        while len(stack) > 0:
+            cell = stack.pop()
+            size += 1
+            col = cell % cols
 
-    for row in range(0, len(matrix)):
-        for col in range(0, len(matrix[row])):
-            point = Point2D(row=row, col=col)
-            if is_low_point(matrix, point):
-                context: Context = {"count": 0, "visited": {}}
-                discover_basin(matrix, point, context)
-                basin_sizes.append(context["count"])
+            for neighbour, inside in ((cell - cols, cell >= cols), (cell + cols, cell < len(cells) - cols),
+                                      (cell - 1, col > 0), (cell + 1, col < cols - 1)):
+                if inside and labels[neighbour] == -1 and cells[neighbour] != WALL:
+                    labels[neighbour] = basin
+                    stack.append(neighbour)
 
-    basin_sizes.sort(reverse=True)
+        sizes.append(size)
 
-    return str(reduce(operator.mul, basin_sizes[0:3]))
+    return (np.array(labels, dtype=np.int64).reshape(rows, cols),
+            np.array(sizes, dtype=np.int64))
 
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
+def solve1(heights: np.ndarray) -> str:
+    return str(scan(heights).risk)
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
 
+def solve2(heights: np.ndarray) -> str:
+    _, sizes = label_basins(heights)
+    largest = np.partition(sizes, len(sizes) - 3)[-3:] if len(sizes) > 3 else sizes
 
-if __name__ == "__main__":
-    main()
+    return str(int(np.prod(largest)))
+
+
+def part1(input: str) -> str:
+    return solve1(parse(input))
+
+
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,36 @@
+# Input generator for https://adventofcode.com/2021/day/10
+
+import random
+from typing import Iterator, List
+
+pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+openers = list(pairs.keys())
+
+
+# size: number of lines, roughly half corrupted and half incomplete
+def generate(size: int, seed: int = 0, length: int = 100) -> Iterator[str]:
+    rng = random.Random(seed)
+
+    for _ in range(0, size):
+        line: List[str] = []
+        stack: List[str] = []
+        corrupt_at = rng.randrange(length) if rng.random() < 0.5 else -1
+        # corrupt_at is skipped when it lands on an empty stack
+        corrupted = False
+
+        for i in range(0, length):
+            if i == corrupt_at and len(stack) > 0:
+                line.append(rng.choice(
+                    [closer for closer in pairs.values() if closer != pairs[stack[-1]]]))
+                corrupted = True
+            elif len(stack) > 0 and rng.random() < 0.45:
+                line.append(pairs[stack.pop()])
+            else:
+                stack.append(rng.choice(openers))
+                line.append(stack[-1])
+
+        # an incomplete line must still have something left to close
+        if not corrupted and len(stack) == 0:
+            line.append(rng.choice(openers))
+
+        yield ''.join(line)
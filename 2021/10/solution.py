@@ -1,77 +1,65 @@
 # https://adventofcode.com/2021/day/0
 
 from math import floor
-import os
-from typing import List
+from typing import Iterable, List, NamedTuple
 
 openers = ["(", "[", "{", "<"]
 closers = [")", "]", "}", ">"]
 error_points = [3, 57, 1197, 25137]
 autocomplete_points = [1, 2, 3, 4]
 
+# a line is either corrupted (error score > 0) or incomplete (autocomplete score)
+LineScore = NamedTuple(
+    "LineScore", [("error", int), ("autocomplete", int)])
 
-def part1(input: str) -> str:
-    score = 0
 
-    for line in input.splitlines():
-        stack: List[str] = []
+def score_line(line: str) -> LineScore:
+    stack: List[str] = []
 
-        for c in line:
-            if c in openers:
-                stack.append(c)
-            else:
-                opener = stack.pop()
+    for c in line:
+        if c in openers:
+            stack.append(c)
+        else:
+            opener = stack.pop()
 
-                if openers.index(opener) != closers.index(c):
-                    score += error_points[closers.index(c)]
-                    break
+            if openers.index(opener) != closers.index(c):
+                return LineScore(error_points[closers.index(c)], 0)
 
-    return str(score)
+    score = 0
 
+    while len(stack) > 0:
+        opener = stack.pop()
+        score *= 5
+        score += autocomplete_points[openers.index(opener)]
 
-def part2(input: str) -> str:
-    scores: List[int] = []
+    return LineScore(0, score)
 
-    for line in input.splitlines():
-        stack: List[str] = []
-        score = 0
-        has_error = False
 
-        for c in line:
-            if c in openers:
-                stack.append(c)
-            else:
-                opener = stack.pop()
+# each line is scored as it is read, so the runner can stream lines from a
+# memory-mapped file without ever holding them all
+def parse_lines(lines: Iterable[bytes]) -> List[LineScore]:
+    return [score_line(line.decode()) for line in lines]
 
-                if openers.index(opener) != closers.index(c):
-                    has_error = True
-                    break
 
-        if has_error:
-            continue
+def parse(input: str) -> List[LineScore]:
+    return parse_lines(input.encode().splitlines())
 
-        while len(stack) > 0:
-            opener = stack.pop()
-            score *= 5
-            score += autocomplete_points[openers.index(opener)]
 
-        scores.append(score)
+def solve1(line_scores: List[LineScore]) -> str:
+    return str(sum(line_score.error for line_score in line_scores))
+
+
+def solve2(line_scores: List[LineScore]) -> str:
+    scores = [line_score.autocomplete for line_score in line_scores if line_score.error == 0]
 
     scores.sort()
 
     return str(scores[floor(len(scores) / 2)])
 
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
-
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
 
-if __name__ == "__main__":
-    main()
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,40 @@
+# Input generator for https://adventofcode.com/2021/day/11
+
+import random
+from math import isqrt
+from typing import Iterator, Optional
+
+
+# size: number of octopuses (a square grid unless width/height are given)
+#
+# Part 2 only returns once every octopus flashes on the same step, which
+# uniformly random grids practically never reach. With synchronise=True the
+# grid is a flat background level of 0..3 with isolated noisier cells (at even
+# rows and columns, never below background - neighbours), guaranteed to sync
+# on step 10 - background:
+#  - nothing starts above the background, so nothing flashes earlier;
+#  - then the whole background flashes at once, and each noisy cell gains at
+#    least one energy per neighbour, which always lifts it past 9.
+def generate(size: int, seed: int = 0, width: Optional[int] = None, height: Optional[int] = None,
+             synchronise: bool = False) -> Iterator[str]:
+    rng = random.Random(seed)
+    width = width or max(1, isqrt(size))
+    height = height or max(1, size // width)
+
+    if not synchronise:
+        for _ in range(0, height):
+            yield ''.join(str(rng.randint(0, 9)) for _ in range(0, width))
+        return
+
+    background = rng.randint(0, 3)
+
+    for row in range(0, height):
+
+        line = []
+        for col in range(0, width):
+            neighbours = (min(row + 1, height - 1) - max(row - 1, 0) + 1) * \
+                (min(col + 1, width - 1) - max(col - 1, 0) + 1) - 1
+            noisy = row % 2 == 0 and col % 2 == 0 and rng.random() < 0.5
+            line.append(rng.randint(max(0, background - neighbours), background) if noisy else background)
+
+        yield ''.join(map(str, line))
@@ -1,11 +1,18 @@
-# https://adventofcode.com/2021/day/1
+# https://adventofcode.com/2021/day/11
 
-import os
 from pathlib import Path
-from typing import Dict, List
+from typing import List, Tuple
+from typing_extensions import NamedTuple
 
+import numpy as np
 
-def parse_input(input: str) -> List[List[int]]:
+from aoc.instrument import instrumented
+
+# synced_at is the first step on which every octopus of a grid flashed, or -1
+BatchResult = NamedTuple('BatchResult', [("flashes", np.ndarray), ("synced_at", np.ndarray)])
+
+
+def parse(input: str) -> List[List[int]]:
     matrix: List[List[int]] = []
 
     for row in input.splitlines():
@@ -16,115 +23,143 @@ def parse_input(input: str) -> List[List[int]]:
     return matrix
 
 
-def increment_all(matrix: List[List[int]]):
-    for row, _ in enumerate(matrix):
-        for col, _ in enumerate(matrix[row]):
-            matrix[row][col] += 1
+def neighbour_offsets(width: int, height: int) -> List[List[int]]:
+    """Flat indices of the (up to eight) neighbours of every cell."""
+    neighbours: List[List[int]] = []
 
+    for row in range(0, height):
+        for col in range(0, width):
+            neighbours.append([r * width + c
+                               for r in range(max(0, row - 1), min(height, row + 2))
+                               for c in range(max(0, col - 1), min(width, col + 2))
+                               if r != row or c != col])
 
-def increment_surrounding(matrix: List[List[int]], row: int, col: int):
-    # top
-    if row > 0:
-        matrix[row - 1][col] += 1
+    return neighbours
 
-        # top-left
-        if col > 0:
-            matrix[row-1][col-1] += 1
 
-        # top-right
-        if col < len(matrix[row - 1]) - 1:
-            matrix[row - 1][col + 1] += 1
+@instrumented("step")
+def step(energy: List[int], neighbours: List[List[int]]) -> int:
+    """Advances the flat grid by one step in place and returns the number of flashes.
 
-    # bottom
-    if row < len(matrix) - 1:
-        matrix[row + 1][col] += 1
+    A cell is queued exactly when its energy reaches 10, so every octopus
+    flashes at most once and only flashing cells spread energy.
+    """
+    queue: List[int] = []
 
-        # bottom-left
-        if col > 0:
-            matrix[row + 1][col - 1] += 1
+    for cell in range(0, len(energy)):
+        energy[cell] += 1
+        if energy[cell] == 10:
+            queue.append(cell)
 
-        # bottom-right
-        if col < len(matrix[row - 1]) - 1:
-            matrix[row + 1][col + 1] += 1
+    flashed = queue[:]
 
-    # left
-    if col > 0:
-        matrix[row][col - 1] += 1
+    while len(queue) > 0:
+        for neighbour in neighbours[queue.pop()]:
+            energy[neighbour] += 1
+            if energy[neighbour] == 10:
+                queue.append(neighbour)
+                flashed.append(neighbour)
 
-    # right
-    if col < len(matrix[row]) - 1:
-        matrix[row][col + 1] += 1
+    for cell in flashed:
+        energy[cell] = 0
 
+    return len(flashed)
 
-def handle_flashing(matrix: List[List[int]]):
-    flashes = 0
-    flashed_coords: Dict[int, Dict[int, bool]] = {}
 
-    while True:
-        new_flashes = 0
+def flatten(matrix: List[List[int]]) -> Tuple[List[int], List[List[int]]]:
+    height = len(matrix)
+    width = len(matrix[0]) if height > 0 else 0
+
+    return [value for row in matrix for value in row], neighbour_offsets(width, height)
+
+
+def step_batch(energy: np.ndarray) -> np.ndarray:
+    """Advances a (grids, rows, cols) array by one step in place; returns flashes per grid."""
+    rows, cols = energy.shape[1:]
+    energy += 1
+    flashed = np.zeros(energy.shape, dtype=bool)
+    new = energy > 9
+    # cascades usually die out in most grids long before the slowest one, so
+    # each round only touches the grids that still have new flashes
+    cascading = np.flatnonzero(new.any(axis=(1, 2)))
+
+    while len(cascading) > 0:
+        # every cell gains the number of its neighbours that just flashed: a
+        # 3x3 box sum of the new flashes (done as two 1-d passes) minus itself
+        fresh = new[cascading]
+        flashed[cascading] |= fresh
+        padded = np.zeros((len(cascading), rows + 2, cols + 2), dtype=np.int16)
+        padded[:, 1:-1, 1:-1] = fresh
+        columns = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+        neighbours = columns[:, :, :-2] + columns[:, :, 1:-1] + columns[:, :, 2:] - fresh
+
+        grown = energy[cascading] + neighbours
+        energy[cascading] = grown
+        new[cascading] = (grown > 9) & ~flashed[cascading]
+        cascading = cascading[new[cascading].any(axis=(1, 2))]
 
-        for row, _ in enumerate(matrix):
-            for col, _ in enumerate(matrix[row]):
-                if matrix[row][col] > 9 and (row not in flashed_coords or col not in flashed_coords[row]):
-                    flashes += 1
-                    new_flashes += 1
+    energy[flashed] = 0
 
-                    if row not in flashed_coords:
-                        flashed_coords[row] = {}
+    return flashed.sum(axis=(1, 2))
 
-                    flashed_coords[row][col] = True
-                    increment_surrounding(matrix, row, col)
 
-        if new_flashes == 0:
+def simulate_batch(grids: np.ndarray, steps: int = 100, max_steps: int = 10000) -> BatchResult:
+    """Flashes during the first `steps` steps and first synchronised step of every grid.
+
+    grids is a (grids, rows, cols) array, e.g. np.array of several parsed
+    grids of the same shape.  A grid drops out of the batch once it has both
+    synchronised and run `steps` steps; grids that never synchronise stop at
+    max_steps with synced_at -1.
+    """
+    # energy only holds the grids still running; active maps them back
+    energy = grids.astype(np.int16)
+    cells = energy.shape[1] * energy.shape[2]
+    flashes = np.zeros(len(energy), dtype=np.int64)
+    synced_at = np.full(len(energy), -1, dtype=np.int64)
+    active = np.arange(len(energy))
+
+    for current in range(1, max(steps, max_steps) + 1):
+        if len(active) == 0:
             break
 
-    return flashes
+        flashed = step_batch(energy)
+        if current <= steps:
+            flashes[active] += flashed
 
+        synced_at[active[(flashed == cells) & (synced_at[active] == -1)]] = current
 
-def cap(matrix: List[List[int]]):
-    for row, _ in enumerate(matrix):
-        for col, _ in enumerate(matrix[row]):
-            if matrix[row][col] > 9:
-                matrix[row][col] = 0
+        if current >= steps:
+            running = synced_at[active] == -1
+            energy, active = energy[running], active[running]
 
+    return BatchResult(flashes, synced_at)
 
-def part1(input: str) -> str:
-    matrix = parse_input(input)
+
+# steps mutate the grid in place, so each part works on its own flat copy of the parsed one
+def solve1(parsed: List[List[int]]) -> str:
+    energy, neighbours = flatten(parsed)
     flashes = 0
 
     for _ in range(0, 100):
-        increment_all(matrix)
-        flashes += handle_flashing(matrix)
-        cap(matrix)
+        flashes += step(energy, neighbours)
 
     return str(flashes)
 
 
-def part2(input: str) -> str:
-    matrix = parse_input(input)
-    step = 0
+def solve2(parsed: List[List[int]]) -> str:
+    energy, neighbours = flatten(parsed)
+    steps = 0
 
     while True:
-        step += 1
-        increment_all(matrix)
-        flashes = handle_flashing(matrix)
+        steps += 1
 
-        if flashes == len(matrix) ** 2:
-            return str(step)
+        if step(energy, neighbours) == len(energy):
+            return str(steps)
 
-        cap(matrix)
 
-
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
-
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
 
-if __name__ == "__main__":
-    main()
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,55 @@
+# Input generator for https://adventofcode.com/2021/day/12
+
+import random
+from typing import Iterator, List, Set, Tuple
+
+
+def cave_name(i: int, big: bool) -> str:
+    name = ""
+
+    while True:
+        name += chr(ord('a') + i % 26)
+        i //= 26
+        if i == 0:
+            break
+
+    # "start" and "end" are reserved
+    return (name + "x").upper() if big else name + "x"
+
+
+# size: number of caves including start and end, about a quarter of them big.
+# extra_connections defaults to size // 2 on top of a random spanning tree.
+# Big caves are never connected to each other, so the number of paths stays finite.
+def generate(size: int, seed: int = 0, extra_connections: int = -1) -> Iterator[str]:
+    rng = random.Random(seed)
+    caves: List[str] = ["start"]
+    big: Set[str] = set()
+
+    for i in range(0, max(0, size - 2)):
+        is_big = rng.random() < 0.25
+        caves.append(cave_name(i, is_big))
+        if is_big:
+            big.add(caves[-1])
+
+    # "end" goes last so the spanning tree never hangs caves off it directly
+    caves.append("end")
+
+    def can_connect(a: str, b: str) -> bool:
+        return a != b and not (a in big and b in big)
+
+    connections: Set[Tuple[str, str]] = set()
+
+    # a random spanning tree keeps every cave reachable
+    for i in range(1, len(caves)):
+        # "start" is small, so there is always at least one candidate
+        candidates = [cave for cave in caves[0:i]
+                      if can_connect(cave, caves[i])]
+        connections.add((rng.choice(candidates), caves[i]))
+
+    for _ in range(0, size // 2 if extra_connections < 0 else extra_connections):
+        a, b = rng.sample(caves, 2)
+        if can_connect(a, b) and (b, a) not in connections:
+            connections.add((a, b))
+
+    for a, b in sorted(connections):
+        yield f"{a}-{b}"
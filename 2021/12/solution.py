@@ -2,9 +2,10 @@
 
 import copy
 from dataclasses import dataclass
-import os
 from typing import Dict, List, TypedDict
 
+from aoc.instrument import instrumented
+
 
 class Cave:
     id: str
@@ -17,7 +18,7 @@ class Cave:
         self.connections = connections
 
 
-def parse_input(input: str) -> Cave:
+def parse(input: str) -> Cave:
     caves_by_id: Dict[str, Cave] = {
         "start": Cave("start", True, set([])), "end": Cave("end", True, set([]))}
 
@@ -45,6 +46,7 @@ Visited = TypedDict('Visited', {
                     "cave_ids": set[str], "allow_double_visit_of_small_cave_once": bool, "did_double_visit_small_cave": bool})
 
 
+@instrumented("traverse")
 def traverse(cave: Cave, context: Context, visited: Visited):
     if cave.small:
         if cave.id in visited["cave_ids"]:
@@ -63,8 +65,7 @@ def traverse(cave: Cave, context: Context, visited: Visited):
         traverse(connection, context, copy.deepcopy(visited))
 
 
-def part1(input: str) -> str:
-    start = parse_input(input)
+def solve1(start: Cave) -> str:
     context: Context = {"total_paths": 0}
 
     traverse(start, context, {"cave_ids": set(
@@ -73,8 +74,7 @@ def part1(input: str) -> str:
     return str(context["total_paths"])
 
 
-def part2(input: str) -> str:
-    start = parse_input(input)
+def solve2(start: Cave) -> str:
     context: Context = {"total_paths": 0}
 
     traverse(start, context, {"cave_ids": set(
@@ -83,16 +83,9 @@ def part2(input: str) -> str:
     return str(context["total_paths"])
 
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
-
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
 
-if __name__ == "__main__":
-    main()
+def part2(input: str) -> str:
+    return solve2(parse(input))
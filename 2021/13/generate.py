@@ -0,0 +1,41 @@
+# Input generator for https://adventofcode.com/2021/day/13
+
+import random
+from typing import Iterator, List, Tuple
+
+
+# size: number of points; folds: number of fold instructions.
+#
+# The paper is built backwards from a `width` x `height` result: every fold
+# doubles one dimension, and each point is mirrored across it at random, so no
+# point ever lies on a fold line.
+def generate(size: int, seed: int = 0, folds: int = 12, width: int = 40, height: int = 6) -> Iterator[str]:
+    rng = random.Random(seed)
+    unfolds: List[Tuple[str, int]] = []
+    paper_width, paper_height = width, height
+
+    for i in range(0, folds):
+        # the last unfold is along x, matching the real inputs' first fold
+        if (folds - i) % 2 == 1:
+            unfolds.append(('x', paper_width))
+            paper_width = paper_width * 2 + 1
+        else:
+            unfolds.append(('y', paper_height))
+            paper_height = paper_height * 2 + 1
+
+    for _ in range(0, size):
+        x, y = rng.randrange(width), rng.randrange(height)
+
+        for axis, line in unfolds:
+            if rng.random() < 0.5:
+                if axis == 'x':
+                    x = 2 * line - x
+                else:
+                    y = 2 * line - y
+
+        yield f"{x},{y}"
+
+    yield ""
+
+    for axis, line in reversed(unfolds):
+        yield f"fold along {axis}={line}"
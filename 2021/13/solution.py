@@ -1,9 +1,10 @@
 # https://adventofcode.com/2021/day/3
 
-import os
 from pathlib import Path
 from typing import List, TypedDict
 
+from aoc.instrument import instrumented
+
 
 class Point2D:
     x: int
@@ -30,7 +31,7 @@ Input = TypedDict(
     'Input', {"points": set[Point2D], "folds": List[Point2D]})
 
 
-def parse_input(input: str) -> Input:
+def parse(input: str) -> Input:
     points: set[Point2D] = set([])
     folds: List[Point2D] = []
 
@@ -55,6 +56,7 @@ def parse_input(input: str) -> Input:
     return {"points": points, "folds": folds}
 
 
+@instrumented("fold")
 def fold(points: set[Point2D], along: Point2D) -> set[Point2D]:
     new_points: set[Point2D] = set([])
 
@@ -74,13 +76,10 @@ def fold(points: set[Point2D], along: Point2D) -> set[Point2D]:
     return new_points
 
 
-def part1(input: str) -> str:
-    parsed_input = parse_input(input)
-
-    parsed_input["points"] = fold(
-        parsed_input["points"], parsed_input["folds"][0])
+def solve1(parsed_input: Input) -> str:
+    points = fold(parsed_input["points"], parsed_input["folds"][0])
 
-    return str(len(parsed_input["points"]))
+    return str(len(points))
 
 
 def points_to_str(points: set[Point2D]) -> str:
@@ -104,25 +103,18 @@ def points_to_str(points: set[Point2D]) -> str:
     return '\n'.join(map(lambda row: ''.join(row), matrix))
 
 
-def part2(input: str) -> str:
-    parsed_input = parse_input(input)
+def solve2(parsed_input: Input) -> str:
+    points = parsed_input["points"]
 
     for fold_along in parsed_input["folds"]:
-        parsed_input["points"] = fold(parsed_input["points"], fold_along)
+        points = fold(points, fold_along)
 
-    return points_to_str(parsed_input["points"])
+    return points_to_str(points)
 
 
-def main() -> None:
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
-
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
 
-if __name__ == "__main__":
-    main()
+def part2(input: str) -> str:
+    return solve2(parse(input))
@@ -0,0 +1,132 @@
+# Benchmarks part1/part2 of Python solutions against their input.data.
+#
+#   python3 -m aoc.bench --day 4 --warmup 2 --repeat 10
+#   python3 -m aoc.bench --json bench.json
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import time
+from functools import partial
+from math import ceil
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from aoc import cache, loader
+from aoc.runner import Day, discover, load, open_input
+
+Stats = NamedTuple('Stats', [("min", float), ("median", float), ("p95", float)])
+# part is "parse", "1" or "2"; parse timings carry an empty answer
+Timing = NamedTuple('Timing', [("day", Day), ("part", str), ("answer", str),
+                               ("wall", Stats), ("cpu", Stats)])
+
+
+def percentile(samples: List[float], p: float) -> float:
+    # nearest-rank, so the result is always one of the measured samples
+    ordered = sorted(samples)
+    rank = max(1, ceil(p / 100 * len(ordered)))
+
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> Stats:
+    return Stats(min(samples), statistics.median(samples), percentile(samples, 95))
+
+
+def measure(fn: Callable[[Any], Any], arg: Any, warmup: int, repeat: int):
+    result: Any = None
+    wall: List[float] = []
+    cpu: List[float] = []
+
+    # solutions may print while solving; keep that out of the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(0, warmup):
+            fn(arg)
+
+        for _ in range(0, repeat):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            result = fn(arg)
+            cpu.append(time.process_time() - cpu_start)
+            wall.append(time.perf_counter() - wall_start)
+
+    return result, summarize(wall), summarize(cpu)
+
+
+def bench_day(day: Day, warmup: int, repeat: int, use_cache: bool) -> List[Timing]:
+    module = load(day)
+    # with the cache on, the parse row measures loading the cached structure
+    parse = partial(cache.parse if use_cache else loader.parse, module)
+
+    with open_input(day) as data:
+        parsed, wall, cpu = measure(parse, data, warmup, repeat)
+
+    timings = [Timing(day, "parse", "", wall, cpu)]
+
+    # both parts are timed against the same parsed input, like the runner does
+    for part, solve in (("1", module.solve1), ("2", module.solve2)):
+        answer, wall, cpu = measure(solve, parsed, warmup, repeat)
+        timings.append(Timing(day, part, answer, wall, cpu))
+
+    return timings
+
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:10.2f}"
+
+
+def print_table(timings: List[Timing]):
+    print(f"{'day':<10}{'part':>5}" +
+          ''.join(f"{h:>10}" for h in ("min ms", "med ms", "p95 ms", "cpu min", "cpu med", "cpu p95")))
+
+    for t in timings:
+        print(f"{t.day.year}/{t.day.day:02d}   {t.part:>5}" +
+              ''.join(format_ms(s) for s in (*t.wall, *t.cpu)))
+
+
+def to_json(timings: List[Timing], warmup: int, repeat: int, use_cache: bool) -> Dict[str, Any]:
+    return {
+        "warmup": warmup,
+        "repeat": repeat,
+        "cache": use_cache,
+        "results": [{
+            "year": t.day.year,
+            "day": t.day.day,
+            "part": t.part,
+            "answer": t.answer,
+            "wall": t.wall._asdict(),
+            "cpu": t.cpu._asdict(),
+        } for t in timings]
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.bench")
+    parser.add_argument("--year", type=int, default=2021)
+    parser.add_argument("--day", type=int)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write results as JSON to PATH")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="time a fresh parse() instead of the parsed-input cache")
+    args = parser.parse_args(argv)
+
+    if args.warmup < 0 or args.repeat < 1:
+        parser.error("--warmup must be >= 0 and --repeat >= 1")
+
+    timings: List[Timing] = []
+
+    for day in discover(args.year, args.day):
+        timings.extend(bench_day(day, args.warmup, args.repeat, args.cache))
+
+    print_table(timings)
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(to_json(timings, args.warmup, args.repeat, args.cache), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# On-disk cache of parse() results, so warm runs skip re-parsing input.data.
+#
+# Entries are keyed by a hash of the input plus a hash of the solution module's
+# source (parse() leans on module-level types such as Board or Point2D, so the
+# whole module is hashed rather than just the function). The directory is kept
+# under MAX_BYTES by evicting the least recently used entries.
+
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple, Optional, Union
+
+from aoc import loader
+from aoc.loader import InputFile
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'parsed'
+MAX_BYTES = 512 * 1024 * 1024
+
+# hashes of the solution source and of the input; hashing reads the whole
+# input, so callers that look it up more than once compute it once up front
+Fingerprint = NamedTuple('Fingerprint', [("source", str), ("input", str)])
+
+
+def hash_data(data: Union[str, bytes, memoryview]) -> str:
+    return hashlib.sha256(data.encode() if isinstance(data, str) else data).hexdigest()
+
+
+def hash_input(data: InputFile) -> str:
+    # hashes the mapped file directly, without reading it into memory first
+    with data.view() as view:
+        return hash_data(view)
+
+
+def source_hash(module: ModuleType) -> str:
+    return hash_data(inspect.getsource(module))
+
+
+def fingerprint(module: ModuleType, data: InputFile) -> Fingerprint:
+    return Fingerprint(source_hash(module), hash_input(data))
+
+
+def cache_path(module: ModuleType, fingerprint: Fingerprint, cache_dir: Path) -> Path:
+    key = hashlib.sha256(
+        (fingerprint.input + fingerprint.source).encode()).hexdigest()
+
+    return cache_dir / f"{module.__name__}-{key}.pickle"
+
+
+def load(path: Path) -> Any:
+    with open(path, 'rb') as f:
+        parsed = pickle.load(f)
+
+    # mtime doubles as the "last used" timestamp for eviction
+    os.utime(path)
+
+    return parsed
+
+
+def store(path: Path, parsed: Any, max_bytes: int) -> bool:
+    # returns whether the entry was written; some results cannot be pickled at
+    # all (e.g. deeply linked object graphs hit the recursion limit)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # write to a temporary file first so concurrent runs never see a partial entry
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        return False
+
+    evict(path.parent, max_bytes)
+
+    return True
+
+
+def evict(cache_dir: Path, max_bytes: int):
+    entries = []
+
+    for entry in cache_dir.glob('*.pickle'):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+
+        entries.append((stat.st_mtime, stat.st_size, entry))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+
+    for _, size, entry in entries:
+        if total <= max_bytes:
+            break
+
+        entry.unlink(missing_ok=True)
+        total -= size
+
+
+def parse(module: ModuleType, data: InputFile, cache_dir: Path = CACHE_DIR, max_bytes: int = MAX_BYTES,
+          key: Optional[Fingerprint] = None) -> Any:
+    path = cache_path(module, key or fingerprint(module, data), cache_dir)
+
+    if path.exists():
+        try:
+            return load(path)
+        except Exception:
+            # unreadable or stale pickle (e.g. a class it references was renamed)
+            path.unlink(missing_ok=True)
+
+    parsed = loader.parse(module, data)
+    # an uncacheable result is simply used as is, like --no-cache
+    store(path, parsed, max_bytes)
+
+    return parsed
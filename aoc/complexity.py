@@ -0,0 +1,192 @@
+# Empirical complexity report: times part1/part2 on generated inputs of size
+# N, 2N, 4N, ... and fits the log-log slope of time (and peak memory) vs size.
+#
+#   python3 -m aoc.complexity
+#   python3 -m aoc.complexity --day 4 --base 200 --steps 5 --json scaling.json
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import tracemalloc
+from math import log
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from aoc.bench import measure
+from aoc.generate import generate
+from aoc.runner import Day, discover, load
+
+# starting size per day, picked so the smallest run takes a few milliseconds
+BASE_SIZES: Dict[int, int] = {
+    1: 20000, 2: 20000, 3: 2000, 4: 50, 5: 200, 6: 20000, 7: 2000,
+    8: 500, 9: 2500, 10: 500, 11: 100, 12: 6, 13: 2000,
+}
+
+# generator options per day; part 2 of day 11 never finishes unless the grid
+# synchronises
+GENERATE_OPTIONS: Dict[int, Dict[str, Any]] = {
+    11: {"synchronise": True},
+}
+
+# timed_out_at is the first size that did not finish within the budget, if any
+Scaling = NamedTuple('Scaling', [("day", Day), ("part", int), ("sizes", List[int]),
+                                 ("seconds", List[float]), ("peak_bytes", List[int]),
+                                 ("time_exponent", float), ("memory_exponent", float),
+                                 ("timed_out_at", Optional[int])])
+
+
+class Timeout(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def time_limit(seconds: float) -> Iterator[None]:
+    # exponential days (e.g. 12) would otherwise hang the whole report
+    def handler(*_: Any):
+        raise Timeout()
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def fit_exponent(sizes: List[int], values: List[float]) -> float:
+    # least-squares slope of log(value) against log(size)
+    points = [(log(size), log(value))
+              for size, value in zip(sizes, values) if value > 0]
+
+    if len(points) < 2:
+        return float('nan')
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+
+    return covariance / variance
+
+
+def peak_memory(fn: Callable[[str], str], input: str) -> int:
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        tracemalloc.start()
+        try:
+            fn(input)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def scale_day(day: Day, base: int, steps: int, repeat: int, budget: float, memory: bool) -> List[Scaling]:
+    module = load(day)
+    options = GENERATE_OPTIONS.get(day.day, {})
+    inputs = [(base * 2 ** i, generate(day, base * 2 ** i, **options)) for i in range(0, steps)]
+    scalings: List[Scaling] = []
+
+    for part, fn in ((1, module.part1), (2, module.part2)):
+        sizes: List[int] = []
+        seconds: List[float] = []
+        peak_bytes: List[int] = []
+        timed_out_at: Optional[int] = None
+
+        for size, input in inputs:
+            try:
+                with time_limit(budget):
+                    _, wall, _ = measure(fn, input, 0, repeat)
+                    peak = peak_memory(fn, input) if memory else 0
+            except Timeout:
+                timed_out_at = size
+                break
+
+            sizes.append(size)
+            seconds.append(wall.min)
+
+            if memory:
+                peak_bytes.append(peak)
+
+        scalings.append(Scaling(day, part, sizes, seconds, peak_bytes,
+                                fit_exponent(sizes, seconds),
+                                fit_exponent(sizes, list(map(float, peak_bytes))),
+                                timed_out_at))
+
+    return scalings
+
+
+def print_table(scalings: List[Scaling], threshold: float):
+    print(f"{'day':<10}{'part':>5}{'sizes':>24}{'last ms':>12}{'time exp':>10}{'mem exp':>10}")
+
+    for s in scalings:
+        sizes = f"{s.sizes[0]}..{s.sizes[-1]}" if len(s.sizes) > 0 else "-"
+        last = f"{s.seconds[-1] * 1000:.2f}" if len(s.seconds) > 0 else "-"
+        flag = "  <-- superlinear" if s.time_exponent > threshold else ""
+        if s.timed_out_at is not None:
+            flag += f"  (timed out at {s.timed_out_at})"
+
+        print(f"{s.day.year}/{s.day.day:02d}   {s.part:>5}{sizes:>24}{last:>12}"
+              f"{s.time_exponent:>10.2f}{s.memory_exponent:>10.2f}{flag}")
+
+
+def to_json(scalings: List[Scaling], threshold: float) -> Dict[str, Any]:
+    return {
+        "threshold": threshold,
+        "results": [{
+            "year": s.day.year,
+            "day": s.day.day,
+            "part": s.part,
+            "sizes": s.sizes,
+            "seconds": s.seconds,
+            "peak_bytes": s.peak_bytes,
+            # NaN is not valid JSON
+            "time_exponent": s.time_exponent if s.time_exponent == s.time_exponent else None,
+            "memory_exponent": s.memory_exponent if s.memory_exponent == s.memory_exponent else None,
+            "flagged": s.time_exponent > threshold,
+            "timed_out_at": s.timed_out_at,
+        } for s in scalings]
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.complexity")
+    parser.add_argument("--year", type=int, default=2021)
+    parser.add_argument("--day", type=int)
+    parser.add_argument("--base", type=int,
+                        help="smallest input size (defaults to a per-day size)")
+    parser.add_argument("--steps", type=int, default=4,
+                        help="number of sizes, doubling each time")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="give up on a part once one size takes longer than this many seconds")
+    parser.add_argument("--threshold", type=float, default=1.3,
+                        help="flag parts whose time exponent exceeds this")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the (slower) tracemalloc peak-memory runs")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write results as JSON to PATH")
+    args = parser.parse_args(argv)
+
+    if args.steps < 2:
+        parser.error("--steps must be at least 2 to fit an exponent")
+
+    scalings: List[Scaling] = []
+
+    for day in discover(args.year, args.day):
+        if not (day.folder / 'generate.py').exists():
+            continue
+
+        base = args.base if args.base is not None else BASE_SIZES.get(day.day, 1000)
+        scalings.extend(scale_day(day, base, args.steps,
+                        args.repeat, args.budget, args.memory))
+
+    print_table(scalings, args.threshold)
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(to_json(scalings, args.threshold), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Writes synthetic inputs of a requested size using a day's generate.py.
+#
+#   python3 -m aoc.generate --day 4 --size 100000 > boards.data
+#   python3 -m aoc.generate --day 9 --size 0 -p width=2000 -p height=500 -o grid.data
+
+import argparse
+import sys
+from typing import Any, Dict, List, Optional
+
+from aoc.runner import Day, discover, load
+
+
+def generate(day: Day, size: int, seed: int = 0, **options: Any) -> str:
+    return '\n'.join(load(day, 'generate').generate(size, seed, **options)) + '\n'
+
+
+def parse_option(option: str) -> Any:
+    key, _, value = option.partition('=')
+
+    for cast in (int, float):
+        try:
+            return key, cast(value)
+        except ValueError:
+            pass
+
+    return key, value
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.generate")
+    parser.add_argument("--year", type=int, default=2021)
+    parser.add_argument("--day", type=int, required=True)
+    parser.add_argument("--size", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-p", dest="options", metavar="KEY=VALUE", action="append", default=[],
+                        help="day-specific generator option, e.g. -p width=500")
+    parser.add_argument("-o", dest="output", metavar="PATH",
+                        help="write to PATH instead of stdout")
+    args = parser.parse_args(argv)
+
+    days = [day for day in discover(args.year, args.day)
+            if (day.folder / 'generate.py').exists()]
+
+    if len(days) == 0:
+        parser.error(f"no generator for {args.year}/{args.day:02d}")
+
+    options: Dict[str, Any] = dict(map(parse_option, args.options))
+    lines = load(days[0], 'generate').generate(args.size, args.seed, **options)
+
+    # written line by line, so huge inputs are never held in memory
+    out = open(args.output, 'w') if args.output is not None else sys.stdout
+    try:
+        for line in lines:
+            out.write(line + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Call counters and timers for named hot-path regions.
+#
+#   @instrumented("Board.mark")
+#   def mark(self, number): ...
+#
+#   with section("fold"):
+#       ...
+#
+# Instrumentation is decided when a solution module is imported: unless
+# enable() was called first, @instrumented returns the function untouched and
+# section() hands back a shared no-op context, so the regions can stay in the
+# code permanently at (almost) no cost.
+
+import json
+from contextlib import nullcontext
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Dict, List, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+enabled = False
+
+# name -> [calls, seconds, active depth]; depth keeps recursive regions from
+# counting the same time more than once
+counters: Dict[str, List[Any]] = {}
+
+_disabled_section = nullcontext()
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def _counter(name: str) -> List[Any]:
+    if name not in counters:
+        counters[name] = [0, 0.0, 0]
+
+    return counters[name]
+
+
+def instrumented(name: str) -> Callable[[F], F]:
+    def decorate(fn: F) -> F:
+        if not enabled:
+            return fn
+
+        counter = _counter(name)
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            counter[0] += 1
+            counter[2] += 1
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                counter[2] -= 1
+                if counter[2] == 0:
+                    counter[1] += perf_counter() - start
+
+        return wrapper  # type: ignore
+
+    return decorate
+
+
+class _Section:
+    def __init__(self, name: str):
+        self.counter = _counter(name)
+
+    def __enter__(self):
+        self.counter[0] += 1
+        self.counter[2] += 1
+        self.start = perf_counter()
+
+    def __exit__(self, *_: Any):
+        self.counter[2] -= 1
+        if self.counter[2] == 0:
+            self.counter[1] += perf_counter() - self.start
+
+
+def section(name: str) -> ContextManager[Any]:
+    if not enabled:
+        return _disabled_section
+
+    return _Section(name)
+
+
+def take() -> Dict[str, Dict[str, Any]]:
+    # returns the counters collected so far and resets them
+    snapshot = {name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds, _) in counters.items() if calls > 0}
+
+    for counter in counters.values():
+        counter[0] = 0
+        counter[1] = 0.0
+
+    return snapshot
+
+
+def merge(into: Dict[str, Dict[str, Any]], other: Dict[str, Dict[str, Any]]):
+    for name, counter in other.items():
+        if name not in into:
+            into[name] = {"calls": 0, "seconds": 0.0}
+
+        into[name]["calls"] += counter["calls"]
+        into[name]["seconds"] += counter["seconds"]
+
+
+def dump(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    return json.dumps(snapshot, indent=2, sort_keys=True)
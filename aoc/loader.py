@@ -0,0 +1,93 @@
+# Memory-mapped access to input files.
+#
+# The file is never decoded into one big str: view() exposes the mapped bytes
+# without copying and lines() yields one line at a time, so single-pass days
+# can parse inputs much larger than RAM.
+
+import mmap
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator, Optional, Union
+
+import numpy as np
+
+# what parse_buffer() hooks receive: the mapped file, or encoded text when a
+# day is parsed from a str
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class InputFile:
+    path: Path
+    _mmap: Optional[mmap.mmap]
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._mmap = None
+
+        with open(self.path, 'rb') as f:
+            # empty files cannot be mapped
+            if f.seek(0, 2) > 0:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> 'InputFile':
+        return self
+
+    def __exit__(self, *_: Any):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def view(self) -> memoryview:
+        return memoryview(self._mmap if self._mmap is not None else b'')
+
+    def lines(self) -> Iterator[bytes]:
+        # same line splitting as str.splitlines() for \n and \r\n endings
+        data = self._mmap
+        if data is None:
+            return
+
+        start = 0
+        size = len(data)
+
+        while start < size:
+            end = data.find(b'\n', start)
+            if end == -1:
+                end = size
+
+            line = data[start:end]
+            yield line[:-1] if line.endswith(b'\r') else line
+
+            start = end + 1
+
+    def text(self) -> str:
+        with self.view() as view:
+            return str(view, 'utf-8')
+
+
+def parse_ints(text: Buffer) -> np.ndarray:
+    """Whitespace-separated integers in text, as an int64 array."""
+    data = bytes(text)
+
+    # np.fromstring() reads an empty or whitespace-only string as [0]
+    if len(data) == 0 or data.isspace():
+        return np.empty(0, dtype=np.int64)
+
+    return np.fromstring(data, dtype=np.int64, sep=' ')
+
+
+def parse(module: ModuleType, data: InputFile) -> Any:
+    # Streaming days expose parse_buffer() or parse_lines(); everything else
+    # gets the whole text.  parse_buffer() is handed the memory-mapped file
+    # itself (no copy, no decoding), so it can read inputs larger than RAM
+    # as long as it does not copy them either.
+    if hasattr(module, 'parse_buffer'):
+        with data.view() as view:
+            return module.parse_buffer(view)
+
+    if hasattr(module, 'parse_lines'):
+        return module.parse_lines(data.lines())
+
+    return module.parse(data.text())
@@ -0,0 +1,90 @@
+# CPU (cProfile) and memory (tracemalloc) profiling of a single solver call.
+
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+# fraction by which traced memory must grow before the sampler takes a new snapshot
+SNAPSHOT_GROWTH = 1.05
+SAMPLE_INTERVAL = 0.005
+# below this fraction of the peak, the sampled snapshot is not reported as the peak's
+PEAK_COVERAGE = 0.9
+
+
+def profile_cpu(fn: Callable[[Any], str], arg: Any, top: int, path: Path) -> str:
+    profiler = cProfile.Profile()
+    answer = profiler.runcall(fn, arg)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+
+    print(f"\nTop {top} functions by cumulative time (full profile in {path}):")
+    pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    return answer
+
+
+class PeakSampler(threading.Thread):
+    # tracemalloc only reports the peak size, not what was allocated at that
+    # moment, so snapshots are taken whenever traced memory reaches a new high
+    snapshot: Optional[tracemalloc.Snapshot]
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.snapshot = None
+        self.snapshot_size = 0
+
+    def run(self):
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+
+        if current > self.snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+
+def profile_mem(fn: Callable[[Any], str], arg: Any, top: int) -> str:
+    sampler = PeakSampler()
+
+    tracemalloc.start()
+    sampler.start()
+    try:
+        answer = fn(arg)
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        # short runs may finish before the first sample
+        sampler.sample()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    assert sampler.snapshot is not None
+    snapshot = sampler.snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+    print(f"\nPeak traced memory: {peak / 1024:.1f} KiB")
+
+    if sampler.snapshot_size >= peak * PEAK_COVERAGE:
+        print(f"Top {top} allocation sites near the peak "
+              f"({sampler.snapshot_size / 1024:.1f} KiB live):")
+    else:
+        # the peak fell between two samples (short-lived allocations or a run
+        # shorter than SAMPLE_INTERVAL), so these sites may not explain it
+        print(f"Top {top} allocation sites at the largest sampled point "
+              f"({sampler.snapshot_size / 1024:.1f} KiB live, "
+              f"{sampler.snapshot_size / peak:.0%} of the peak; the peak itself was not sampled):")
+
+    for stat in snapshot.statistics('lineno')[0:top]:
+        print(f"  {stat.size / 1024:10.1f} KiB {stat.count:>9} blocks  {stat.traceback}")
+
+    return answer
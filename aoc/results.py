@@ -0,0 +1,48 @@
+# On-disk store of answers, so unchanged days are not recomputed.
+#
+# An entry is keyed by (solution source hash, input hash) and holds both parts;
+# editing either solution.py or input.data invalidates it.
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Optional, Tuple
+
+from aoc.cache import Fingerprint, fingerprint
+from aoc.loader import InputFile
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'results'
+
+
+def result_path(module: ModuleType, key: Fingerprint, results_dir: Path) -> Path:
+    return results_dir / f"{module.__name__}-{key.source}-{key.input}.json"
+
+
+def get(module: ModuleType, data: InputFile, results_dir: Path = RESULTS_DIR,
+        key: Optional[Fingerprint] = None) -> Optional[Tuple[str, str]]:
+    path = result_path(module, key or fingerprint(module, data), results_dir)
+
+    try:
+        with open(path) as f:
+            answers = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return answers["part1"], answers["part2"]
+
+
+def put(module: ModuleType, data: InputFile, part1: str, part2: str, results_dir: Path = RESULTS_DIR,
+        key: Optional[Fingerprint] = None):
+    path = result_path(module, key or fingerprint(module, data), results_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # stale answers for older versions of this day are never looked up again
+    for old in results_dir.glob(f"{module.__name__}-*.json"):
+        old.unlink(missing_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=results_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump({"part1": part1, "part2": part2}, f)
+    os.replace(tmp, path)
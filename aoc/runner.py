@@ -0,0 +1,217 @@
+# Runs Python solutions in a single interpreter instead of one python3 per day.
+#
+#   python3 -m aoc.runner --year 2021 --day 4
+#   python3 -m aoc.runner --year 2021
+#   python3 -m aoc.runner --all --jobs 4
+
+import argparse
+import importlib.util
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from aoc import cache, instrument, loader, profiling, results
+from aoc.loader import InputFile
+
+ROOT = Path(__file__).resolve().parent.parent
+
+Day = NamedTuple('Day', [("year", int), ("day", int), ("folder", Path)])
+Result = NamedTuple('Result', [("day", Day), ("part1", str), ("part2", str)])
+
+
+def discover(year: Optional[int] = None, day: Optional[int] = None) -> List[Day]:
+    days: List[Day] = []
+
+    for path in sorted(ROOT.glob('[0-9][0-9][0-9][0-9]/[0-9][0-9]/solution.py')):
+        folder = path.parent
+        found = Day(int(folder.parent.name), int(folder.name), folder)
+
+        if year is not None and found.year != year:
+            continue
+
+        if day is not None and found.day != day:
+            continue
+
+        days.append(found)
+
+    return days
+
+
+def load(day: Day, file: str = 'solution') -> ModuleType:
+    # modules are registered under a unique name so that functions and classes
+    # defined in them can be pickled by reference; a worker can only resolve
+    # that name if it loaded the module too, i.e. it was forked after load()
+    # or (like run_day) calls load() itself
+    name = f"aoc_{day.year}_{day.day:02d}"
+    if file != 'solution':
+        name += f"_{file}"
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(
+        name, day.folder / f"{file}.py")
+    assert spec is not None and spec.loader is not None
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def open_input(day: Day) -> InputFile:
+    return InputFile(day.folder / 'input.data')
+
+
+def run_day(day: Day, use_cache: bool = True, force: bool = False) -> Result:
+    module = load(day)
+
+    with open_input(day) as data:
+        # one pass over the input serves the result store and the parse cache
+        key = cache.fingerprint(module, data)
+
+        if not force:
+            stored = results.get(module, data, key=key)
+
+            if stored is not None:
+                return Result(day, *stored)
+
+        parsed = cache.parse(module, data, key=key) if use_cache else loader.parse(module, data)
+        result = Result(day, module.solve1(parsed), module.solve2(parsed))
+        results.put(module, data, result.part1, result.part2, key=key)
+
+    return result
+
+
+Counters = Dict[str, Dict[str, Any]]
+
+
+def run_day_counted(day: Day, use_cache: bool, force: bool) -> Tuple[Result, Counters]:
+    # instrumentation counters live in whichever process ran the day
+    return run_day(day, use_cache, force), instrument.take()
+
+
+def collect(outcomes: Iterable[Tuple[Result, Counters]], counters: Optional[Counters]) -> Iterator[Result]:
+    for result, day_counters in outcomes:
+        if counters is not None:
+            instrument.merge(counters, day_counters)
+
+        yield result
+
+
+def run(days: List[Day], jobs: int = 1, use_cache: bool = True, force: bool = False,
+        counters: Optional[Counters] = None) -> Iterable[Result]:
+    run_one = partial(run_day_counted, use_cache=use_cache, force=force)
+
+    if jobs > 1 and len(days) > 1:
+        # workers that are not forked start with instrumentation off, and it
+        # must be on before they import any solution module
+        initializer = instrument.enable if instrument.enabled else None
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as pool:
+            # map() keeps the input order, so output stays sorted by day
+            yield from collect(pool.map(run_one, days), counters)
+    else:
+        yield from collect(map(run_one, days), counters)
+
+
+def profile_day(day: Day, part: int, mode: str, top: int, use_cache: bool = True):
+    module = load(day)
+
+    # parsing happens outside the profiler so only the solver is measured
+    with open_input(day) as data:
+        parsed = cache.parse(module, data) if use_cache else loader.parse(module, data)
+
+    solve = module.solve1 if part == 1 else module.solve2
+
+    if mode == "cpu":
+        path = cache.CACHE_DIR.parent / 'profiles' / \
+            f"{day.year}-{day.day:02d}-part{part}.prof"
+        answer = profiling.profile_cpu(solve, parsed, top, path)
+    else:
+        answer = profiling.profile_mem(solve, parsed, top)
+
+    print(f"\nSolution (Part {part}):\n" + answer)
+
+
+def print_result(result: Result):
+    print(f"\n========= {result.day.year}/{result.day.day:02d}")
+    print("\nSolution (Part 1):\n" + result.part1)
+    print("\nSolution (Part 2):\n" + result.part2)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.runner")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--day", type=int)
+    parser.add_argument("--all", action="store_true",
+                        help="run every day (of --year, if given)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="spread days across N worker processes")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="always re-parse input.data")
+    parser.add_argument("--force", action="store_true",
+                        help="recompute answers even if a stored result matches")
+    parser.add_argument("--profile", choices=["cpu", "mem"],
+                        help="profile one part of one day with cProfile or tracemalloc")
+    parser.add_argument("--part", type=int, choices=[1, 2],
+                        help="part to profile (default: 1)")
+    parser.add_argument("--top", type=int, default=20,
+                        help="number of functions / allocation sites to show when profiling")
+    parser.add_argument("--instrument", metavar="PATH",
+                        help="count calls and time of instrumented regions and write them as JSON to PATH (implies --force)")
+
+    args = parser.parse_args(argv)
+
+    if not args.all and args.year is None:
+        parser.error("pass --year (optionally with --day) or --all")
+
+    if args.all and args.day is not None:
+        parser.error("--all and --day are mutually exclusive")
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    if args.profile is not None and (args.all or args.day is None):
+        parser.error("--profile needs a single --year and --day")
+
+    if args.part is not None and args.profile is None:
+        parser.error("--part is only used with --profile")
+
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    days = discover(args.year, args.day)
+
+    # must happen before any solution module is imported
+    if args.instrument is not None:
+        instrument.enable()
+
+    if len(days) == 0:
+        sys.exit("No Python solutions found")
+
+    if args.profile is not None:
+        profile_day(days[0], args.part or 1, args.profile, args.top, args.cache)
+        return
+
+    counters: Counters = {}
+    force = args.force or args.instrument is not None
+
+    for result in run(days, args.jobs, args.cache, force, counters):
+        print_result(result)
+
+    print("\n=========")
+
+    if args.instrument is not None:
+        with open(args.instrument, 'w') as f:
+            f.write(instrument.dump(counters))
+
+
+if __name__ == "__main__":
+    main()
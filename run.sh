@@ -6,5 +6,5 @@ FOLDER="./$YEAR/$DAY"
 if [[ -f "$FOLDER/index.ts" ]]; then
     ts-node "$FOLDER"
 elif [[ -f "$FOLDER/solution.py" ]]; then
-    python3 "$FOLDER/solution.py"
+    python3 -m aoc.runner --year "$YEAR" --day "$DAY"
 fi
\ No newline at end of file
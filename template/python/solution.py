@@ -1,23 +1,21 @@
 # https://adventofcode.com/%year%/day/%day%
+#
+# run with: python3 -m aoc.runner --year %year% --day %day%
 
-import os
-from pathlib import Path
+# parse() runs once per input; solve1/solve2 both receive its result and must not mutate it
+Parsed = str
 
-def part1(input: str) -> str:
-    return ""
+def parse(input: str) -> Parsed:
+    return input
 
-def part2(input: str) -> str:
+def solve1(parsed: Parsed) -> str:
     return ""
 
-def main():
-    with open(os.path.join(os.path.dirname(__file__), './input.data')) as f:
-        input = f.read()
+def solve2(parsed: Parsed) -> str:
+    return ""
 
-        print("\n=========")
-        print("\nSolution (Part 1):\n" + part1(input))
-        print("\n=========")
-        print("\nSolution (Part 2):\n" + part2(input))
-        print("\n=========")
+def part1(input: str) -> str:
+    return solve1(parse(input))
 
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+def part2(input: str) -> str:
+    return solve2(parse(input))